@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import warnings
+
+# Suppress deprecation warnings from third-party libraries BEFORE any imports
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+warnings.filterwarnings("ignore", message=".*scipy.linalg.basic.*")
+warnings.filterwarnings("ignore", message=".*LinAlgError.*")
+warnings.filterwarnings("ignore", module="evidently")
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from airflow.decorators import dag, task
+from airflow.models.param import Param
+
+CONFIG_PATH = Path("/opt/airflow/include/configs/params.yaml")
+EXPECTATION_PATH = Path("/opt/airflow/include/expectations/imdb_reviews.json")
+DATA_DIR = Path("/opt/airflow/data")
+
+
+@dag(
+    dag_id="mlops_imdb_backfill",
+    schedule=None,
+    start_date=datetime(2025, 1, 1),
+    catchup=False,
+    max_active_runs=1,
+    params={
+        "start_date": Param("2025-01-01", type="string", format="date"),
+        "end_date": Param("2025-01-07", type="string", format="date"),
+        "max_workers": Param(4, type="integer", minimum=1),
+    },
+    tags=["mlops", "imdb", "backfill"],
+)
+def mlops_imdb_backfill_dag():
+    @task
+    def backfill_range(params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+        import yaml
+        from airflow.exceptions import AirflowFailException
+        from airflow.models import Variable
+
+        from src.pipeline.backfill import BackfillConfig, run_backfill
+        from src.pipeline.config import load_params
+
+        assert params is not None
+        config = load_params(CONFIG_PATH)
+        promotion_rules = (
+            yaml.safe_load(Variable.get("PROMOTION_RULES", default_var="")) or config["promotion"]
+        )
+        summaries = run_backfill(
+            config=BackfillConfig(
+                start_date=params["start_date"],
+                end_date=params["end_date"],
+                max_workers=params["max_workers"],
+            ),
+            params=config,
+            data_dir=DATA_DIR,
+            expectation_path=EXPECTATION_PATH,
+            model_name=Variable.get("MODEL_NAME", default_var="imdb_sentiment"),
+            promotion_rules=promotion_rules,
+        )
+        failed = [summary["ds"] for summary in summaries if summary["status"] == "failed"]
+        if failed:
+            raise AirflowFailException(f"Backfill failed for partitions: {', '.join(failed)}")
+        return summaries
+
+    backfill_range()
+
+
+mlops_imdb_backfill_dag()
@@ -8,33 +8,44 @@ warnings.filterwarnings("ignore", message=".*scipy.linalg.basic.*")
 warnings.filterwarnings("ignore", message=".*LinAlgError.*")
 warnings.filterwarnings("ignore", module="evidently")
 
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
 
-import yaml
 from airflow import Dataset
 from airflow.decorators import dag, task
-from airflow.exceptions import AirflowFailException
-from airflow.models import Variable
-
-from src.data.ingest import IngestConfig, ingest_partition
-from src.data.validate import validate_raw
-from src.features.build import FeatureConfig, build_features
-from src.monitor.drift_job import DriftConfig, run_drift_report
-from src.train.eval import evaluate_run
-from src.train.register import PromotionDecision, evaluate_promotion
-from src.train.train import TrainingConfig, train_model
-from src.utils.io import load_csv
+
+# Keep module scope cheap: the scheduler re-parses this file every
+# MIN_FILE_PROCESS_INTERVAL seconds. Pipeline modules (Great Expectations,
+# Evidently, MLflow, sklearn, HF datasets), params.yaml and Airflow Variables
+# are resolved inside the tasks at run time.
+#
+# Tasks up to evaluate (and monitor) are memoized: each fingerprints its params.yaml
+# sections, upstream files and code, and returns the outputs recorded under
+# data/manifests/<ds>/ when nothing changed, so reruns only redo register/deploy.
 
 CONFIG_PATH = Path("/opt/airflow/include/configs/params.yaml")
 EXPECTATION_PATH = Path("/opt/airflow/include/expectations/imdb_reviews.json")
 DATA_DIR = Path("/opt/airflow/data")
 
+# Dataset URIs must be static at parse time; read the env-backed Variables
+# (AIRFLOW_VAR_*) directly instead of querying the metadata database.
+RAW_BUCKET = os.getenv("AIRFLOW_VAR_RAW_BUCKET", "mlops-raw")
+FEATURE_BUCKET = os.getenv("AIRFLOW_VAR_FEATURE_BUCKET", "mlops-features")
+MONITOR_BUCKET = os.getenv("AIRFLOW_VAR_MONITOR_BUCKET", "mlops-monitor")
+
 
 def load_config() -> Dict[str, Dict]:
-    with CONFIG_PATH.open() as fp:
-        return yaml.safe_load(fp)
+    from src.pipeline.config import load_params
+
+    return load_params(CONFIG_PATH)
+
+
+def timings_path(ds: str) -> Path:
+    from src.utils.profiling import TIMINGS_FILENAME
+
+    return DATA_DIR / "artifacts" / ds / TIMINGS_FILENAME
 
 
 @dag(
@@ -47,86 +58,181 @@ def load_config() -> Dict[str, Dict]:
     tags=["mlops", "imdb"],
 )
 def mlops_imdb_dag():
-    config = load_config()
-    raw_bucket = Variable.get("RAW_BUCKET", default_var="mlops-raw")
-    feature_bucket = Variable.get("FEATURE_BUCKET", default_var="mlops-features")
-    monitor_bucket = Variable.get("MONITOR_BUCKET", default_var="mlops-monitor")
-    promotion_rules = yaml.safe_load(Variable.get("PROMOTION_RULES", default_var="")) or config["promotion"]
-    model_name = Variable.get("MODEL_NAME", default_var="imdb_sentiment")
-
-    @task(outlets=[Dataset(f"s3://{raw_bucket}/imdb/{{{{ ds }}}}.csv")])
+    @task(outlets=[Dataset(f"s3://{RAW_BUCKET}/imdb/{{{{ ds }}}}.csv")])
     def ingest(ds: str) -> str:
-        ingest_cfg = IngestConfig(
-            dataset_name=config["dataset"]["name"],
-            split=config["dataset"]["ingest"]["split"],
-            sample_size=config["dataset"]["ingest"]["daily_sample_size"],
-            seed_offset=config["dataset"]["ingest"]["seed_offset"],
-        )
+        from src.data.ingest import ingest_partition
+        from src.pipeline.config import ingest_config
+        from src.pipeline.memo import run_memoized
+        from src.utils.profiling import flush_timings_on_exit
+
+        config = load_config()
         output = DATA_DIR / "raw" / f"imdb_{ds}.csv"
-        ingest_partition(ds=ds, output_path=output, config=ingest_cfg)
-        return str(output)
+
+        def run() -> Dict[str, str]:
+            with flush_timings_on_exit(timings_path(ds)):
+                ingest_partition(ds=ds, output_path=output, config=ingest_config(config))
+            return {"raw_path": str(output)}
+
+        return run_memoized("ingest", ds, config, [], DATA_DIR, run)["raw_path"]
 
     @task()
-    def validate(raw_path: str) -> str:
-        df = load_csv(Path(raw_path))
-        result = validate_raw(df, EXPECTATION_PATH)
-        if not result.success:
-            raise AirflowFailException("Validation failed; blocking downstream tasks")
-        return raw_path
-
-    @task(outlets=[Dataset(f"s3://{feature_bucket}/imdb/{{{{ ds }}}}.parquet")])
+    def validate(raw_path: str, ds: str) -> str:
+        from airflow.exceptions import AirflowFailException
+
+        from src.data.validate import validate_raw
+        from src.pipeline.memo import run_memoized
+        from src.utils.io import load_csv
+        from src.utils.profiling import flush_timings_on_exit
+
+        def run() -> Dict[str, str]:
+            with flush_timings_on_exit(timings_path(ds)):
+                df = load_csv(Path(raw_path))
+                result = validate_raw(df, EXPECTATION_PATH)
+            if not result.success:
+                raise AirflowFailException("Validation failed; blocking downstream tasks")
+            return {"raw_path": raw_path}
+
+        inputs = [Path(raw_path), EXPECTATION_PATH]
+        return run_memoized("validate", ds, load_config(), inputs, DATA_DIR, run)["raw_path"]
+
+    @task(outlets=[Dataset(f"s3://{FEATURE_BUCKET}/imdb/{{{{ ds }}}}.parquet")])
     def build(raw_path: str, ds: str) -> Dict[str, str]:
-        feature_cfg = FeatureConfig(
-            text_column=config["features"]["text_column"],
-            label_column=config["features"]["label_column"],
-            tfidf_max_features=config["features"]["tfidf_max_features"],
-            min_df=config["features"]["min_df"],
-            max_df=config["features"]["max_df"],
-        )
-        raw_df = load_csv(Path(raw_path))
-        features_path, artifacts_dir = build_features(
-            df=raw_df,
-            config=feature_cfg,
-            output_features=DATA_DIR / "features" / f"imdb_{ds}.parquet",
-            artifacts_dir=DATA_DIR / "artifacts" / ds,
-        )
-        return {"features_path": str(features_path), "artifacts_dir": str(artifacts_dir)}
+        from src.features.build import VECTORIZER_FILENAME, build_features
+        from src.pipeline.config import feature_config
+        from src.pipeline.memo import run_memoized
+        from src.utils.io import load_csv
+        from src.utils.profiling import flush_timings_on_exit
+
+        config = load_config()
+
+        def run() -> Dict[str, str]:
+            with flush_timings_on_exit(timings_path(ds)):
+                raw_df = load_csv(Path(raw_path))
+                features_path, artifacts_dir = build_features(
+                    df=raw_df,
+                    config=feature_config(config),
+                    output_features=DATA_DIR / "features" / f"imdb_{ds}.parquet",
+                    artifacts_dir=DATA_DIR / "artifacts" / ds,
+                )
+            return {
+                "features_path": str(features_path),
+                "artifacts_dir": str(artifacts_dir),
+                "vectorizer_path": str(artifacts_dir / VECTORIZER_FILENAME),
+            }
+
+        return run_memoized("build", ds, config, [Path(raw_path)], DATA_DIR, run)
 
     @task
-    def train(feature_outputs: Dict[str, str]) -> Dict[str, str]:
-        train_cfg = TrainingConfig(
-            label_column=config["features"]["label_column"],
-            test_size=config["training"]["test_size"],
-            random_state=config["training"]["random_state"],
-            class_weight=config["training"]["class_weight"],
-        )
-        model_path, run_id = train_model(
-            features_path=Path(feature_outputs["features_path"]),
-            config=train_cfg,
-            artifacts_dir=Path(feature_outputs["artifacts_dir"]),
-        )
-        metrics_artifact = Path(feature_outputs["artifacts_dir"]) / "metrics.json"
-        return {
-            "run_id": run_id,
-            "metrics_artifact": str(metrics_artifact),
-            "model_path": str(model_path),
-        }
+    def select(feature_outputs: Dict[str, str], ds: str) -> Dict[str, str]:
+        from src.pipeline.config import feature_selection_config
+        from src.pipeline.memo import run_memoized
+        from src.utils.profiling import flush_timings_on_exit
+
+        config = load_config()
+        selection_cfg = feature_selection_config(config)
+        if selection_cfg is None:
+            return feature_outputs
+        from src.features.build import VECTORIZER_FILENAME
+        from src.features.select import SELECTED_FEATURES_FILENAME, select_features
+
+        features_path = Path(feature_outputs["features_path"])
+        artifacts_dir = Path(feature_outputs["artifacts_dir"])
+        selected_path = DATA_DIR / "features" / f"imdb_{ds}_selected.parquet"
+
+        def run() -> Dict[str, str]:
+            with flush_timings_on_exit(timings_path(ds)):
+                select_features(
+                    features_path=features_path,
+                    config=selection_cfg,
+                    artifacts_dir=artifacts_dir,
+                    output_path=selected_path,
+                )
+            return {
+                "features_path": str(selected_path),
+                "artifacts_dir": str(artifacts_dir),
+                "selected_features_path": str(artifacts_dir / SELECTED_FEATURES_FILENAME),
+            }
+
+        inputs = [features_path, artifacts_dir / VECTORIZER_FILENAME]
+        return run_memoized("select", ds, config, inputs, DATA_DIR, run)
 
     @task
-    def evaluate(train_outputs: Dict[str, str]) -> Dict[str, str]:
-        evaluation = evaluate_run(
-            metrics_artifact=Path(train_outputs["metrics_artifact"]),
-            run_id=train_outputs["run_id"],
-        )
-        return {
-            "run_id": train_outputs["run_id"],
-            "metrics": evaluation.metrics,
-        }
+    def train(feature_outputs: Dict[str, str], ds: str) -> Dict[str, str]:
+        from src.features.build import VECTORIZER_FILENAME
+        from src.pipeline.config import quantization_config, training_config
+        from src.pipeline.memo import run_memoized
+        from src.train.train import train_model
+        from src.utils.profiling import flush_timings_on_exit
+
+        config = load_config()
+        train_cfg = training_config(config)
+        quantization_cfg = quantization_config(config)
+        features_path = Path(feature_outputs["features_path"])
+        artifacts_dir = Path(feature_outputs["artifacts_dir"])
+
+        def run() -> Dict[str, str]:
+            with flush_timings_on_exit(timings_path(ds)):
+                model_path, run_id = train_model(
+                    features_path=features_path,
+                    config=train_cfg,
+                    artifacts_dir=artifacts_dir,
+                )
+                if quantization_cfg is not None:
+                    from src.train.quantize import export_quantized
+
+                    export_quantized(
+                        features_path=features_path,
+                        artifacts_dir=artifacts_dir,
+                        training_config=train_cfg,
+                        config=quantization_cfg,
+                        run_id=run_id,
+                    )
+            return {
+                "run_id": run_id,
+                "metrics_artifact": str(artifacts_dir / "metrics.json"),
+                "model_path": str(model_path),
+            }
+
+        inputs = [features_path, artifacts_dir / VECTORIZER_FILENAME]
+        return run_memoized("train", ds, config, inputs, DATA_DIR, run)
+
+    @task
+    def evaluate(train_outputs: Dict[str, str], ds: str) -> Dict[str, Any]:
+        from src.pipeline.memo import run_memoized
+        from src.train.eval import evaluate_run
+        from src.train.quantize import QUANTIZATION_REPORT_FILENAME
+        from src.utils.profiling import flush_timings_on_exit
+
+        metrics_artifact = Path(train_outputs["metrics_artifact"])
+
+        def run() -> Dict[str, Any]:
+            # Timings recorded by the upstream tasks are logged to MLflow inside evaluate_run.
+            with flush_timings_on_exit(timings_path(ds)):
+                evaluation = evaluate_run(
+                    metrics_artifact=metrics_artifact,
+                    run_id=train_outputs["run_id"],
+                )
+            return {
+                "run_id": train_outputs["run_id"],
+                "metrics": evaluation.metrics,
+            }
+
+        inputs = [metrics_artifact, metrics_artifact.parent / QUANTIZATION_REPORT_FILENAME]
+        return run_memoized("evaluate", ds, load_config(), inputs, DATA_DIR, run)
 
     @task
-    def register(evaluation_payload: Dict[str, str]) -> Dict[str, str | int | bool | Dict]:
+    def register(evaluation_payload: Dict[str, Any]) -> Dict[str, str | int | bool | Dict]:
+        import yaml
+        from airflow.models import Variable
+
+        from src.train.register import evaluate_promotion
+
+        promotion_rules = (
+            yaml.safe_load(Variable.get("PROMOTION_RULES", default_var=""))
+            or load_config()["promotion"]
+        )
         decision = evaluate_promotion(
-            model_name=model_name,
+            model_name=Variable.get("MODEL_NAME", default_var="imdb_sentiment"),
             run_id=evaluation_payload["run_id"],
             metrics=evaluation_payload["metrics"],
             promotion_rules=promotion_rules,
@@ -148,38 +254,49 @@ def mlops_imdb_dag():
         trigger_fastapi_reload(environment={})
         return f"Deployment triggered for version {decision_payload['version']}"
 
-    @task(outlets=[Dataset(f"s3://{monitor_bucket}/imdb/{{{{ ds }}}}.json")])
-    def monitor(feature_outputs: Dict[str, str], ds: str) -> Dict[str, str]:
-        config_data = DriftConfig(
-            text_column=config["features"]["text_column"],
-            label_column=config["features"]["label_column"],
-            psi_warning_threshold=config["monitoring"]["psi_warning_threshold"],
-            psi_alert_threshold=config["monitoring"]["psi_alert_threshold"],
-        )
+    @task(outlets=[Dataset(f"s3://{MONITOR_BUCKET}/imdb/{{{{ ds }}}}.json")])
+    def monitor(
+        feature_outputs: Dict[str, str], evaluation_payload: Dict[str, Any], ds: str
+    ) -> Dict[str, str]:
+        from src.monitor.drift_job import run_drift_report
+        from src.pipeline.config import drift_config
+        from src.pipeline.memo import run_memoized
+        from src.train.eval import log_timings
+        from src.utils.profiling import flush_timings_on_exit
+
+        config = load_config()
         current_path = Path(feature_outputs["features_path"])
         reference_days = config["monitoring"]["drift_reference_days"]
-        reference_date = (datetime.strptime(ds, "%Y-%m-%d") - timedelta(days=reference_days)).strftime(
-            "%Y-%m-%d"
-        )
+        reference_date = (
+            datetime.strptime(ds, "%Y-%m-%d") - timedelta(days=reference_days)
+        ).strftime("%Y-%m-%d")
         reference_path = DATA_DIR / "features" / f"imdb_{reference_date}.parquet"
         if not reference_path.exists():
             reference_path = current_path
-        summary = run_drift_report(
-            reference_path=reference_path,
-            current_path=current_path,
-            config=config_data,
-            output_dir=DATA_DIR / "monitor" / ds,
-        )
-        return summary
+
+        def run() -> Dict[str, str]:
+            with flush_timings_on_exit(timings_path(ds)):
+                drift = run_drift_report(
+                    reference_path=reference_path,
+                    current_path=current_path,
+                    config=drift_config(config),
+                    output_dir=DATA_DIR / "monitor" / ds,
+                )
+            # evaluate_run logged timings before this stage ran; log them again with it.
+            log_timings(timings_path(ds), evaluation_payload["run_id"])
+            return drift
+
+        inputs = [reference_path, current_path]
+        return run_memoized("monitor", ds, config, inputs, DATA_DIR, run)
 
     raw_file = ingest()
     validated = validate(raw_file)
-    features = build(validated)
+    features = select(build(validated))
     training_outputs = train(features)
     evaluation = evaluate(training_outputs)
     decision = register(evaluation)
     deploy(decision)
-    monitor(features)
+    monitor(features, evaluation)
 
 
 mlops_imdb_dag()
@@ -2,20 +2,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import yaml
-
-from src.data.ingest import IngestConfig, ingest_partition
+from src.data.ingest import ingest_partition
+from src.pipeline.config import ingest_config, load_params
 
 
 def main() -> None:
-    config_path = Path("include/configs/params.yaml")
-    config = yaml.safe_load(config_path.read_text())
-    ingest_cfg = IngestConfig(
-        dataset_name=config["dataset"]["name"],
-        split=config["dataset"]["ingest"]["split"],
-        sample_size=config["dataset"]["ingest"]["daily_sample_size"],
-        seed_offset=config["dataset"]["ingest"]["seed_offset"],
-    )
+    config = load_params(Path("include/configs/params.yaml"))
+    ingest_cfg = ingest_config(config)
     output_dir = Path("data/raw")
     output_dir.mkdir(parents=True, exist_ok=True)
     ingest_partition("2025-01-01", output_dir / "imdb_2025-01-01.csv", ingest_cfg)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import httpx
+import numpy as np
+
+DEFAULT_BATCH_SIZES = [1, 8, 32]
+
+
+@dataclass
+class LoadTestConfig:
+    requests: int = 200
+    concurrency: int = 8
+    rate: float | None = None
+    batch_sizes: List[int] = field(default_factory=lambda: list(DEFAULT_BATCH_SIZES))
+    timeout_seconds: float = 30.0
+    # Sent as X-Request-Deadline-Ms so the service drops requests still queued after it.
+    deadline_ms: float | None = None
+
+
+@dataclass
+class RequestSample:
+    batch_size: int
+    latency_seconds: float
+    status_code: int
+
+
+def load_texts(path: Path, text_field: str = "text") -> List[str]:
+    """Read texts from JSONL lines that are either ``/predict`` payloads or records.
+
+    Lines with an ``inputs`` list contribute each ``inputs[*].text``; other lines
+    contribute ``record[text_field]``.
+    """
+    texts: List[str] = []
+    for line in Path(path).read_text().splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "inputs" in record:
+            texts.extend(item["text"] for item in record["inputs"])
+        elif text_field in record:
+            texts.append(str(record[text_field]))
+    if not texts:
+        raise ValueError(f"No texts found in {path} (text field '{text_field}')")
+    return texts
+
+
+def build_payloads(texts: List[str], config: LoadTestConfig) -> List[Dict[str, Any]]:
+    """Cycle through texts, alternating batch sizes so each size gets a similar share."""
+    text_cycle: Iterator[str] = itertools.cycle(texts)
+    size_cycle = itertools.cycle(config.batch_sizes)
+    return [
+        {"inputs": [{"text": next(text_cycle)} for _ in range(next(size_cycle))]}
+        for _ in range(config.requests)
+    ]
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    payload: Dict[str, Any],
+    headers: Dict[str, str] | None,
+    started: float,
+) -> RequestSample:
+    try:
+        response = await client.post("/predict", json=payload, headers=headers)
+        status_code = response.status_code
+    except httpx.HTTPError:
+        status_code = 0
+    return RequestSample(
+        batch_size=len(payload["inputs"]),
+        latency_seconds=time.perf_counter() - started,
+        status_code=status_code,
+    )
+
+
+async def _replay(
+    client: httpx.AsyncClient,
+    payloads: List[Dict[str, Any]],
+    config: LoadTestConfig,
+) -> tuple[List[RequestSample], float]:
+    headers = {"X-Request-Deadline-Ms": str(config.deadline_ms)} if config.deadline_ms else None
+    start = time.perf_counter()
+
+    if config.rate:
+        rate = config.rate
+
+        async def scheduled(index: int, payload: Dict[str, Any]) -> RequestSample:
+            # Open loop: request i is sent at start + i / rate whatever is still in flight,
+            # and its latency counts from that scheduled time, so time spent waiting behind
+            # a slow service stays in the percentiles instead of being omitted.
+            due = start + index / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await _send(client, payload, headers, due)
+
+        samples = await asyncio.gather(*(scheduled(i, p) for i, p in enumerate(payloads)))
+        return list(samples), time.perf_counter() - start
+
+    # Closed loop: ``concurrency`` clients each send their next request after a response.
+    queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+    closed_samples: List[RequestSample] = []
+
+    async def worker() -> None:
+        while True:
+            try:
+                payload = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            closed_samples.append(await _send(client, payload, headers, time.perf_counter()))
+
+    await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    return closed_samples, time.perf_counter() - start
+
+
+def summarize(samples: List[RequestSample], elapsed_seconds: float) -> Dict[str, Dict[str, float]]:
+    """Throughput and latency percentiles (ms), overall and per batch size."""
+    groups: Dict[str, List[RequestSample]] = {"all": samples}
+    for sample in sorted(samples, key=lambda sample: sample.batch_size):
+        groups.setdefault(f"batch={sample.batch_size}", []).append(sample)
+    report: Dict[str, Dict[str, float]] = {}
+    for name, group in groups.items():
+        latencies_ms = np.array([sample.latency_seconds for sample in group]) * 1000
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+        report[name] = {
+            "requests": len(group),
+            "errors": sum(1 for sample in group if sample.status_code != 200),
+            "shed": sum(1 for sample in group if sample.status_code in (429, 504)),
+            "requests_per_second": len(group) / elapsed_seconds,
+            "texts_per_second": sum(sample.batch_size for sample in group) / elapsed_seconds,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+        }
+    return report
+
+
+async def run_load_test(
+    texts: List[str],
+    config: LoadTestConfig,
+    url: str | None = None,
+) -> Dict[str, Dict[str, float]]:
+    """Replay payloads against ``url`` or, when omitted, the in-process ASGI app."""
+    payloads = build_payloads(texts, config)
+    if url:
+        # Open-loop runs must not be throttled by the client's own connection pool.
+        limits = httpx.Limits(max_connections=None if config.rate else config.concurrency)
+        client = httpx.AsyncClient(base_url=url, timeout=config.timeout_seconds, limits=limits)
+    else:
+        from src.serve.app import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=config.timeout_seconds,
+        )
+    async with client:
+        # Warm-up request so model loading is not counted as request latency. A failure
+        # here shows up again in the replayed requests, so it must not abort the run.
+        try:
+            await client.post("/predict", json=payloads[0])
+        except httpx.HTTPError as exc:
+            print(f"Warm-up request failed: {exc!r}")
+        samples, elapsed = await _replay(client, payloads, config)
+    return summarize(samples, elapsed)
+
+
+def format_report(report: Dict[str, Dict[str, float]]) -> str:
+    header = f"{'group':<10} {'reqs':>6} {'errs':>5} {'shed':>5} {'req/s':>8} {'text/s':>9} "
+    header += f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    lines = [header]
+    for name, row in report.items():
+        lines.append(
+            f"{name:<10} {row['requests']:>6.0f} {row['errors']:>5.0f} {row['shed']:>5.0f} "
+            f"{row['requests_per_second']:>8.1f} {row['texts_per_second']:>9.1f} "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay JSONL payloads against /predict")
+    parser.add_argument("jsonl", type=Path, help="JSONL of /predict payloads or text records")
+    parser.add_argument("--text-field", default="text", help="Record field used as review text")
+    parser.add_argument("--url", help="Target service URL; omit to drive the app in-process")
+    parser.add_argument(
+        "--artifacts-dir",
+        type=Path,
+        help="Model artifacts for in-process mode; defaults to a synthetic model",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Closed-loop clients (ignored with --rate)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Open-loop arrival rate in requests/second; latency counts from each scheduled send",
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument(
+        "--deadline-ms", type=float, help="Per-request deadline sent to the service"
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    config = LoadTestConfig(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        batch_sizes=args.batch_sizes,
+        deadline_ms=args.deadline_ms,
+    )
+    texts = load_texts(args.jsonl, args.text_field)
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.url:
+            # In-process mode serves a local model; the app reads this at import time.
+            artifacts_dir = args.artifacts_dir
+            if artifacts_dir is None:
+                from src.bench.synthetic import build_synthetic_artifacts
+
+                artifacts_dir = build_synthetic_artifacts(Path(tmp) / "artifacts")
+            os.environ["MODEL_ARTIFACTS_DIR"] = str(artifacts_dir)
+        report = asyncio.run(run_load_test(texts, config, url=args.url))
+
+    print(format_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+EXPECTATION_PATH = PROJECT_ROOT / "include" / "expectations" / "imdb_reviews.json"
+DEFAULT_SIZES = [1000, 5000]
+SERVE_BATCH_SIZE = 32
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    size: int
+    repeats: int
+    median_seconds: float
+    min_seconds: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[n={self.size}]"
+
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "repeats": self.repeats,
+            "median_seconds": self.median_seconds,
+            "min_seconds": self.min_seconds,
+        }
+
+
+@dataclass
+class Regression:
+    key: str
+    baseline_seconds: float
+    current_seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_seconds / self.baseline_seconds
+
+
+def _measure(name: str, size: int, func: Callable[[], Any], repeats: int) -> BenchmarkResult:
+    func()  # warm-up: imports, caches, lazily compiled regexes
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return BenchmarkResult(
+        name=name,
+        size=size,
+        repeats=repeats,
+        median_seconds=statistics.median(samples),
+        min_seconds=min(samples),
+    )
+
+
+def run_suite(sizes: List[int], repeats: int, workdir: Path) -> List[BenchmarkResult]:
+    """Benchmark each pipeline stage and serving inference on synthetic data of each size."""
+    from datasets import Dataset
+
+    from src.bench.synthetic import FEATURE_CONFIG, build_synthetic_artifacts, generate_reviews
+    from src.data.ingest import IngestConfig, ingest_partition
+    from src.data.validate import validate_raw
+    from src.features.build import build_features
+    from src.monitor.drift_job import DriftConfig, run_drift_report
+    from src.serve.local_model import LocalSentimentModel
+    from src.train.train import TrainingConfig, train_model
+    from src.utils.metrics import compute_binary_metrics
+
+    source_df = generate_reviews(2 * max(sizes), seed=1).drop(columns="partition_date")
+    source = Dataset.from_pandas(source_df)
+    training_cfg = TrainingConfig(
+        label_column="label", test_size=0.2, random_state=123, class_weight="balanced"
+    )
+    drift_cfg = DriftConfig(
+        text_column="text", label_column="label", psi_warning_threshold=0.2, psi_alert_threshold=0.3
+    )
+
+    results: List[BenchmarkResult] = []
+    for size in sizes:
+        size_dir = workdir / f"n{size}"
+        df = generate_reviews(size, seed=size)
+        texts = df["text"].tolist()
+        ingest_cfg = IngestConfig(
+            dataset_name="synthetic", split="train", sample_size=size, seed_offset=42
+        )
+        features_path = size_dir / "features.parquet"
+        reference_path = size_dir / "reference.parquet"
+        build_features(df, FEATURE_CONFIG, reference_path, size_dir / "reference")
+        model = LocalSentimentModel.from_artifacts(
+            build_synthetic_artifacts(size_dir / "serve", n_rows=size, seed=size)
+        )
+        rng = np.random.default_rng(size)
+        y_true = rng.integers(0, 2, size=size)
+        y_proba = rng.random(size)
+
+        def predict_batches() -> None:
+            for start in range(0, len(texts), SERVE_BATCH_SIZE):
+                model.predict(texts[start : start + SERVE_BATCH_SIZE])
+
+        benchmarks: Dict[str, Callable[[], Any]] = {
+            "ingest_sample": lambda: ingest_partition(
+                "2025-01-01", size_dir / "raw.csv", ingest_cfg, dataset=source
+            ),
+            "validate": lambda: validate_raw(df, EXPECTATION_PATH),
+            "build_features": lambda: build_features(
+                df, FEATURE_CONFIG, features_path, size_dir / "artifacts"
+            ),
+            "train_model": lambda: train_model(features_path, training_cfg, size_dir / "artifacts"),
+            "compute_metrics": lambda: compute_binary_metrics(y_true, y_proba),
+            "drift_report": lambda: run_drift_report(
+                reference_path, features_path, drift_cfg, size_dir / "monitor"
+            ),
+            "serve_predict": predict_batches,
+        }
+        for name, func in benchmarks.items():
+            result = _measure(name, size, func, repeats)
+            print(f"{result.key:<32} median={result.median_seconds:.4f}s")
+            results.append(result)
+    return results
+
+
+def save_results(results: List[BenchmarkResult], path: Path, repeats: int) -> None:
+    payload = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "results": {result.key: result.as_dict for result in results},
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+) -> List[Regression]:
+    """Return benchmarks whose median slowed down by more than ``threshold`` (0.2 = 20%)."""
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        regression = Regression(
+            key=key,
+            baseline_seconds=reference["median_seconds"],
+            current_seconds=result["median_seconds"],
+        )
+        if regression.ratio > 1 + threshold:
+            regressions.append(regression)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite on synthetic reviews")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and save results")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--repeats", type=int, default=3)
+    run_parser.add_argument("--output", type=Path, default=Path("data/bench/latest.json"))
+
+    compare_parser = subparsers.add_parser("compare", help="Flag regressions against a baseline")
+    compare_parser.add_argument("--baseline", type=Path, default=Path("data/bench/baseline.json"))
+    compare_parser.add_argument("--current", type=Path, default=Path("data/bench/latest.json"))
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        # Keep stage instrumentation and MLflow tracking local to the benchmark run.
+        os.environ["PIPELINE_PROFILING"] = "0"
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["MLFLOW_TRACKING_URI"] = Path(tmp, "mlruns").as_uri()
+            results = run_suite(args.sizes, args.repeats, Path(tmp))
+        save_results(results, args.output, args.repeats)
+        print(f"Saved {len(results)} results to {args.output}")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    regressions = compare_results(baseline, current, args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.key}: {regression.baseline_seconds:.4f}s -> "
+            f"{regression.current_seconds:.4f}s ({regression.ratio:.2f}x)"
+        )
+    if regressions:
+        raise SystemExit(1)
+    print(f"No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
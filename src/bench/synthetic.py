@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.features.build import FeatureConfig, build_features
+from src.train.train import split_features
+
+POSITIVE_WORDS = (
+    "brilliant moving superb charming gripping delightful masterful stunning heartfelt "
+    "hilarious memorable wonderful excellent beautiful"
+).split()
+NEGATIVE_WORDS = (
+    "boring clumsy dreadful tedious awful predictable lifeless forgettable painful "
+    "incoherent bland terrible wooden disappointing"
+).split()
+NEUTRAL_WORDS = (
+    "the movie film plot actor actress director scene story ending character script camera "
+    "music score sequel cast studio audience minutes dialogue performance role screen drama "
+    "comedy thriller was is and but with very quite really this that of in"
+).split()
+# IMDb reviews average roughly 230 words with a long right tail.
+MEAN_LOG_WORDS = 5.2
+SIGMA_LOG_WORDS = 0.7
+SENTIMENT_RATE = 0.08
+
+FEATURE_CONFIG = FeatureConfig(
+    text_column="text",
+    label_column="label",
+    tfidf_max_features=20000,
+    min_df=5,
+    max_df=0.8,
+)
+
+
+def generate_reviews(
+    n_rows: int,
+    seed: int = 0,
+    partition_date: str = "2025-01-01",
+) -> pd.DataFrame:
+    """Generate IMDb-like reviews with a balanced binary label; needs no network access."""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 2, size=n_rows)
+    lengths = np.clip(rng.lognormal(MEAN_LOG_WORDS, SIGMA_LOG_WORDS, size=n_rows), 10, 2500)
+    neutral = np.array(NEUTRAL_WORDS)
+    # A long tail of rare pseudo-words keeps the vocabulary size realistic for TF-IDF.
+    rare = np.array([f"w{index:05d}" for index in range(30000)])
+    texts = []
+    for label, length in zip(labels, lengths.astype(int)):
+        polar = np.array(POSITIVE_WORDS if label else NEGATIVE_WORDS)
+        n_polar = max(1, rng.binomial(length, SENTIMENT_RATE))
+        n_rare = rng.binomial(length, 0.2)
+        words = np.concatenate(
+            [
+                rng.choice(neutral, size=length - n_polar - n_rare),
+                rng.choice(polar, size=n_polar),
+                rare[(rng.zipf(1.3, size=n_rare) - 1) % len(rare)],
+            ]
+        )
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+    return pd.DataFrame({"text": texts, "label": labels, "partition_date": partition_date})
+
+
+def build_synthetic_artifacts(artifacts_dir: Path, n_rows: int = 2000, seed: int = 0) -> Path:
+    """Build features and fit a classifier on synthetic reviews without touching MLflow.
+
+    The resulting directory has the same layout as ``data/artifacts/<ds>`` and can be
+    served with ``LocalSentimentModel.from_artifacts``.
+    """
+    artifacts_dir = Path(artifacts_dir)
+    features_path, _ = build_features(
+        df=generate_reviews(n_rows, seed=seed),
+        config=FEATURE_CONFIG,
+        output_features=artifacts_dir / "features.parquet",
+        artifacts_dir=artifacts_dir,
+    )
+    X, y = split_features(pd.read_parquet(features_path), FEATURE_CONFIG.label_column)
+    classifier = LogisticRegression(max_iter=200, random_state=seed, class_weight="balanced")
+    classifier.fit(X, y)
+    joblib.dump(classifier, artifacts_dir / "model.joblib")
+    return artifacts_dir
@@ -5,9 +5,10 @@ from dataclasses import dataclass
 from pathlib import Path
 
 import pandas as pd
-from datasets import load_dataset
+from datasets import Dataset, load_dataset
 
 from src.utils.io import write_csv
+from src.utils.profiling import file_size, profile_stage, profiled
 
 
 @dataclass
@@ -31,24 +32,42 @@ def deterministic_sample_indices(total_size: int, ds: str, sample_size: int, see
     return rng.tolist()
 
 
-def ingest_partition(ds: str, output_path: Path, config: IngestConfig) -> Path:
-    """Load a deterministic sample of the IMDb dataset and persist it locally."""
-    dataset = load_dataset(config.dataset_name, split=config.split)
+def load_source_dataset(config: IngestConfig) -> Dataset:
+    with profile_stage("ingest.load_dataset"):
+        return load_dataset(config.dataset_name, split=config.split)
+
+
+@profiled("ingest")
+def ingest_partition(
+    ds: str,
+    output_path: Path,
+    config: IngestConfig,
+    dataset: Dataset | None = None,
+) -> Path:
+    """Load a deterministic sample of the IMDb dataset and persist it locally.
+
+    Pass a preloaded ``dataset`` to reuse one source load across several partitions.
+    """
+    if dataset is None:
+        dataset = load_source_dataset(config)
     total_size = len(dataset)
     if config.sample_size > total_size:
         raise ValueError(f"Sample size {config.sample_size} exceeds dataset size {total_size}")
 
-    indices = deterministic_sample_indices(
-        total_size=total_size,
-        ds=ds,
-        sample_size=config.sample_size,
-        seed_offset=config.seed_offset,
-    )
-    sampled = dataset.select(indices)
-    df = sampled.to_pandas()
-    df["partition_date"] = ds
+    with profile_stage("ingest.sample"):
+        indices = deterministic_sample_indices(
+            total_size=total_size,
+            ds=ds,
+            sample_size=config.sample_size,
+            seed_offset=config.seed_offset,
+        )
+        sampled = dataset.select(indices)
+        df = sampled.to_pandas()
+        df["partition_date"] = ds
     output_path = Path(output_path)
-    write_csv(df, output_path)
+    with profile_stage("ingest.write_csv") as timing:
+        write_csv(df, output_path)
+        timing.output_bytes = file_size(output_path)
     return output_path
 
 
@@ -7,6 +7,8 @@ from pathlib import Path
 import pandas as pd
 from great_expectations.dataset import PandasDataset
 
+from src.utils.profiling import profiled
+
 
 @dataclass
 class ValidationResult:
@@ -14,6 +16,7 @@ class ValidationResult:
     result: dict
 
 
+@profiled("validate")
 def validate_raw(df: pd.DataFrame, suite_path: Path) -> ValidationResult:
     """Validate a DataFrame against a Great Expectations suite."""
     # Create PandasDataset directly to avoid recursion issues with pandas 2.2+
@@ -9,7 +9,10 @@ import joblib
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 
-from src.utils.io import write_csv
+from src.features.tokenizer import analyze
+from src.utils.profiling import file_size, profile_stage, profiled
+
+VECTORIZER_FILENAME = "tfidf_vectorizer.joblib"
 
 
 @dataclass
@@ -21,6 +24,7 @@ class FeatureConfig:
     max_df: float
 
 
+@profiled("build_features")
 def build_features(
     df: pd.DataFrame,
     config: FeatureConfig,
@@ -33,22 +37,34 @@ def build_features(
         min_df=config.min_df,
         max_df=config.max_df,
         dtype="float32",
+        analyzer=analyze,
     )
-    features = vectorizer.fit_transform(df[config.text_column])
-    features_df = pd.DataFrame(
-        features.toarray(),
-        columns=vectorizer.get_feature_names_out(),
-    )
-    features_df[config.label_column] = df[config.label_column].values
-    features_df["partition_date"] = df["partition_date"].values
+    with profile_stage("build_features.fit_vectorizer"):
+        features = vectorizer.fit_transform(df[config.text_column])
+    # analyze yields the same tokens as the default word analyzer, so the fitted vocabulary
+    # and IDF weights are unchanged; persist the plain analyzer so the artifact stays a
+    # standard TfidfVectorizer.
+    vectorizer.set_params(analyzer="word")
+    with profile_stage("build_features.densify") as timing:
+        features_df = pd.DataFrame(
+            features.toarray(),
+            columns=vectorizer.get_feature_names_out(),
+        )
+        features_df[config.label_column] = df[config.label_column].values
+        features_df["partition_date"] = df["partition_date"].values
+        timing.output_bytes = int(features_df.memory_usage(index=False).sum())
 
     output_features = Path(output_features)
     output_features.parent.mkdir(parents=True, exist_ok=True)
-    features_df.to_parquet(output_features, index=False)
+    with profile_stage("build_features.write_parquet") as timing:
+        features_df.to_parquet(output_features, index=False)
+        timing.output_bytes = file_size(output_features)
 
     artifacts_dir = Path(artifacts_dir)
     artifacts_dir.mkdir(parents=True, exist_ok=True)
-    joblib.dump(vectorizer, artifacts_dir / "tfidf_vectorizer.joblib")
+    with profile_stage("build_features.save_vectorizer") as timing:
+        joblib.dump(vectorizer, artifacts_dir / VECTORIZER_FILENAME)
+        timing.output_bytes = file_size(artifacts_dir / VECTORIZER_FILENAME)
     metadata = {
         "text_column": config.text_column,
         "label_column": config.label_column,
@@ -60,6 +76,6 @@ def build_features(
 
 
 def load_vectorizer(artifacts_dir: Path) -> TfidfVectorizer:
-    return joblib.load(Path(artifacts_dir) / "tfidf_vectorizer.joblib")
+    return joblib.load(Path(artifacts_dir) / VECTORIZER_FILENAME)
 
 
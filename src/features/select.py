@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.feature_selection import chi2
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from src.features.build import load_vectorizer
+from src.utils.metrics import compute_binary_metrics
+from src.utils.profiling import file_size, profile_stage, profiled
+
+SELECTED_FEATURES_FILENAME = "selected_features.npy"
+SELECTION_TRADEOFF_FILENAME = "selection_tradeoff.json"
+NON_FEATURE_COLUMNS = ("partition_date",)
+
+
+@dataclass
+class FeatureSelectionConfig:
+    label_column: str
+    k: int
+    method: str = "chi2"
+    tradeoff_ks: List[int] = field(default_factory=list)
+    # Scores are computed on the training split only, so this must match TrainingConfig.
+    test_size: float = 0.2
+    random_state: int = 123
+
+
+def rank_features(X: csr_matrix, y: np.ndarray, method: str, random_state: int) -> np.ndarray:
+    """Column positions ordered from most to least label-relevant."""
+    if method == "chi2":
+        scores, _ = chi2(X, y)
+        scores = np.nan_to_num(scores)
+    elif method == "l1":
+        # Importance along an L1 path: a term's weight in a sparse logistic regression.
+        clf = LogisticRegression(penalty="l1", solver="liblinear", C=1.0, random_state=random_state)
+        scores = np.abs(clf.fit(X, y).coef_[0])
+    else:
+        raise ValueError(f"Unknown feature selection method '{method}'")
+    return np.argsort(-scores, kind="stable")
+
+
+def selection_tradeoff(
+    X_train: csr_matrix,
+    X_test: csr_matrix,
+    y_train: np.ndarray,
+    y_test: np.ndarray,
+    ranking: np.ndarray,
+    ks: List[int],
+    random_state: int,
+) -> List[Dict[str, float]]:
+    """Fit one classifier per k and report accuracy against model size and scoring time."""
+    rows = []
+    for k in sorted({min(k, len(ranking)) for k in ks} | {len(ranking)}):
+        columns = np.sort(ranking[:k])
+        clf = LogisticRegression(max_iter=200, random_state=random_state)
+        start = time.perf_counter()
+        clf.fit(X_train[:, columns], y_train)
+        fit_seconds = time.perf_counter() - start
+        test_features = X_test[:, columns]
+        start = time.perf_counter()
+        y_proba = clf.predict_proba(test_features)[:, 1]
+        predict_seconds = time.perf_counter() - start
+        metrics = compute_binary_metrics(y_test, y_proba)
+        rows.append(
+            {
+                "k": int(k),
+                "accuracy": float(np.mean((y_proba >= 0.5) == y_test)),
+                "pr_auc": metrics.pr_auc,
+                "roc_auc": metrics.roc_auc,
+                "fit_seconds": fit_seconds,
+                "predict_ms_per_1k": 1000 * predict_seconds * 1000 / max(len(y_test), 1),
+                "coef_bytes": int(clf.coef_.nbytes),
+                "dense_feature_bytes": int(k * (X_train.shape[0] + X_test.shape[0]) * 4),
+            }
+        )
+    return rows
+
+
+@profiled("select_features")
+def select_features(
+    features_path: Path,
+    config: FeatureSelectionConfig,
+    artifacts_dir: Path,
+    output_path: Path | None = None,
+) -> Path:
+    """Keep the top-k features and store their vectorizer ids with the artifacts.
+
+    The kept term columns are written to ``output_path`` (default: rewrite
+    ``features_path`` in place), and ``selected_features.npy`` holds the matching
+    ``TfidfVectorizer`` column ids so serving can slice the same columns out of the full
+    TF-IDF row.
+    """
+    features_path = Path(features_path)
+    output_path = Path(output_path) if output_path is not None else features_path
+    artifacts_dir = Path(artifacts_dir)
+    with profile_stage("select_features.read", input_bytes=file_size(features_path)):
+        df = pd.read_parquet(features_path)
+    term_columns = [
+        column
+        for column in df.columns
+        if column != config.label_column and column not in NON_FEATURE_COLUMNS
+    ]
+    X = csr_matrix(df[term_columns].to_numpy(dtype=np.float32))
+    y = df[config.label_column].to_numpy()
+    train_rows, test_rows = train_test_split(
+        np.arange(len(y)),
+        test_size=config.test_size,
+        random_state=config.random_state,
+        stratify=y,
+    )
+
+    with profile_stage("select_features.rank"):
+        ranking = rank_features(X[train_rows], y[train_rows], config.method, config.random_state)
+    kept = np.sort(ranking[: config.k])
+
+    if config.tradeoff_ks:
+        with profile_stage("select_features.tradeoff"):
+            tradeoff = selection_tradeoff(
+                X[train_rows],
+                X[test_rows],
+                y[train_rows],
+                y[test_rows],
+                ranking,
+                config.tradeoff_ks,
+                config.random_state,
+            )
+        (artifacts_dir / SELECTION_TRADEOFF_FILENAME).write_text(json.dumps(tradeoff, indent=2))
+
+    kept_columns = [term_columns[index] for index in kept]
+    vocabulary = load_vectorizer(artifacts_dir).vocabulary_
+    np.save(
+        artifacts_dir / SELECTED_FEATURES_FILENAME,
+        np.array([vocabulary[column] for column in kept_columns], dtype=np.int64),
+    )
+    with profile_stage("select_features.write_parquet") as timing:
+        df[kept_columns + [config.label_column, *NON_FEATURE_COLUMNS]].to_parquet(
+            output_path, index=False
+        )
+        timing.output_bytes = file_size(output_path)
+
+    metadata_path = artifacts_dir / "metadata.json"
+    metadata: Dict[str, Any] = json.loads(metadata_path.read_text())
+    metadata["feature_selection"] = {
+        "method": config.method,
+        "k": len(kept_columns),
+        "n_candidates": len(term_columns),
+    }
+    metadata_path.write_text(json.dumps(metadata, indent=2))
+    return output_path
+
+
+def load_selected_features(artifacts_dir: Path) -> np.ndarray | None:
+    path = Path(artifacts_dir) / SELECTED_FEATURES_FILENAME
+    return np.load(path) if path.exists() else None
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import re
+import string
+from typing import Dict, Iterable, List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# TfidfVectorizer's default word analyzer: lowercase, then this token pattern.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# For ASCII text the pattern matches maximal runs of [A-Za-z0-9_] of length >= 2, so a byte
+# translation (lowercase word characters, blank out the rest) plus split() yields the same
+# tokens at a fraction of the regex cost.
+_ASCII_WORD = (string.ascii_letters + string.digits + "_").encode()
+_ASCII_TABLE = bytes(
+    ord(chr(byte).lower()) if byte in _ASCII_WORD else ord(" ") for byte in range(256)
+)
+
+
+def analyze(text: str) -> List[str]:
+    """Tokens exactly as ``TfidfVectorizer()``'s default analyzer yields them."""
+    if text.isascii():
+        words = text.encode("ascii").translate(_ASCII_TABLE).decode("ascii").split()
+        return [word for word in words if len(word) > 1]
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class VocabularyTokenizer:
+    """Turn texts into vocabulary ids and TF-IDF rows matching a fitted ``TfidfVectorizer``.
+
+    ``transform`` is bit-identical to ``vectorizer.transform`` for the default word
+    analyzer, but tokenizes ASCII text without the regex, counts a whole batch with a few
+    numpy calls instead of one Python dict per document, and looks up out-of-vocabulary
+    tokens without raising ``KeyError``.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray, dtype: type = np.float32):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.dtype = dtype
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer: TfidfVectorizer) -> VocabularyTokenizer:
+        if not _uses_default_analyzer(vectorizer):
+            raise ValueError("VocabularyTokenizer only supports the default word analyzer")
+        return cls(vectorizer.vocabulary_, vectorizer.idf_, dtype=vectorizer.dtype)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.idf)
+
+    def token_ids(self, texts: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Vocabulary ids of all in-vocabulary tokens, plus the row offsets of each text."""
+        ids, offsets, _ = self._tokenize(texts)
+        return ids, offsets
+
+    def counts(self, texts: Iterable[str]) -> csr_matrix:
+        """Term counts per text, with sorted column indices like ``CountVectorizer``."""
+        return self._counts(*self.token_ids(texts))
+
+    def transform(self, texts: Iterable[str]) -> csr_matrix:
+        """L2-normalised TF-IDF rows, identical to the fitted vectorizer's output."""
+        return self._weight(self.counts(texts))
+
+    def transform_with_oov(self, texts: Iterable[str]) -> tuple[csr_matrix, np.ndarray]:
+        """``transform`` plus each text's share of tokens missing from the vocabulary."""
+        ids, offsets, n_tokens = self._tokenize(texts)
+        in_vocabulary = np.diff(offsets)
+        oov_rates = np.divide(
+            n_tokens - in_vocabulary,
+            n_tokens,
+            out=np.zeros(len(n_tokens), dtype=np.float64),
+            where=n_tokens > 0,
+        )
+        return self._weight(self._counts(ids, offsets)), oov_rates
+
+    def _tokenize(self, texts: Iterable[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lookup = self.vocabulary.get
+        ids: List[int] = []
+        offsets = [0]
+        n_tokens: List[int] = []
+        for text in texts:
+            tokens = analyze(text)
+            n_tokens.append(len(tokens))
+            ids.extend(token_id for token_id in map(lookup, tokens) if token_id is not None)
+            offsets.append(len(ids))
+        return (
+            np.asarray(ids, dtype=np.int64),
+            np.asarray(offsets, dtype=np.int64),
+            np.asarray(n_tokens, dtype=np.int64),
+        )
+
+    def _counts(self, ids: np.ndarray, offsets: np.ndarray) -> csr_matrix:
+        n_rows = len(offsets) - 1
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(offsets))
+        # One sort over (row, id) keys yields every row's distinct ids in order with counts.
+        keys, values = np.unique(rows * self.n_features + ids, return_counts=True)
+        indptr = np.searchsorted(keys, np.arange(n_rows + 1) * self.n_features)
+        index_dtype = np.int32 if len(keys) <= np.iinfo(np.int32).max else np.int64
+        return csr_matrix(
+            (
+                values.astype(self.dtype),
+                (keys % self.n_features).astype(index_dtype),
+                indptr.astype(index_dtype),
+            ),
+            shape=(n_rows, self.n_features),
+        )
+
+    def _weight(self, features: csr_matrix) -> csr_matrix:
+        features.data *= self.idf[features.indices]
+        return normalize(features, norm="l2", copy=False)
+
+
+def _uses_default_analyzer(vectorizer: TfidfVectorizer) -> bool:
+    return (
+        vectorizer.analyzer == "word"
+        and vectorizer.lowercase
+        and vectorizer.preprocessor is None
+        and vectorizer.tokenizer is None
+        and vectorizer.strip_accents is None
+        and vectorizer.stop_words is None
+        and vectorizer.token_pattern == TOKEN_PATTERN.pattern
+        and tuple(vectorizer.ngram_range) == (1, 1)
+        and not vectorizer.binary
+        and not vectorizer.sublinear_tf
+        and vectorizer.use_idf
+        and vectorizer.norm == "l2"
+    )
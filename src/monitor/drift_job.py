@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import json
 import warnings
 from dataclasses import dataclass
@@ -10,6 +11,9 @@ import pandas as pd
 from evidently.metrics import ColumnDriftMetric
 from evidently.report import Report
 
+from src.monitor.sketch import PredictionSketch, load_sketches, population_stability_index
+from src.utils.profiling import profile_stage, profiled
+
 # Suppress deprecation warnings from evidently library
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="evidently")
 warnings.filterwarnings("ignore", message=".*scipy.linalg.basic.*")
@@ -23,6 +27,7 @@ class DriftConfig:
     psi_alert_threshold: float
 
 
+@profiled("run_drift_report")
 def run_drift_report(
     reference_path: Path,
     current_path: Path,
@@ -37,7 +42,8 @@ def run_drift_report(
             ColumnDriftMetric(column_name=config.label_column),
         ]
     )
-    report.run(reference_data=reference_df, current_data=current_df)
+    with profile_stage("run_drift_report.compute"):
+        report.run(reference_data=reference_df, current_data=current_df)
 
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -49,14 +55,90 @@ def run_drift_report(
     payload = json.loads(json_path.read_text())
     psi = payload["metrics"][0]["result"]["drift_score"]
 
-    status = "normal"
+    summary = {"psi": psi, "status": _drift_status(psi, config)}
+    (output_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+def _drift_status(psi: float, config: DriftConfig) -> str:
     if psi >= config.psi_alert_threshold:
-        status = "alert"
-    elif psi >= config.psi_warning_threshold:
-        status = "warning"
+        return "alert"
+    if psi >= config.psi_warning_threshold:
+        return "warning"
+    return "normal"
 
-    summary = {"psi": psi, "status": status}
-    (output_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+
+def reference_sketch(raw_path: Path, artifacts_dir: Path, text_column: str) -> PredictionSketch:
+    """Sketch of the training partition as the service would have scored it."""
+    from src.serve.local_model import LocalSentimentModel
+
+    texts = pd.read_csv(raw_path)[text_column].astype(str).tolist()
+    model = LocalSentimentModel.from_artifacts(Path(artifacts_dir))
+    features, oov_rates = model.transform_with_oov(texts)
+    sketch = PredictionSketch()
+    sketch.update(model.predict_features(features), [len(text) for text in texts], oov_rates)
+    return sketch
+
+
+@profiled("run_live_drift_report")
+def run_live_drift_report(
+    raw_path: Path,
+    artifacts_dir: Path,
+    sketch_dir: Path,
+    config: DriftConfig,
+    output_dir: Path,
+) -> Dict[str, object]:
+    """Compare the sketches flushed by the service with the served model's training partition.
+
+    ``raw_path`` and ``artifacts_dir`` are the partition and artifacts the served model was
+    trained from; ``sketch_dir`` holds the flushed windows to compare (e.g. one UTC date).
+    PSI is computed per sketch over the shared fixed bins and the worst one sets the status.
+    """
+    with profile_stage("run_live_drift_report.reference"):
+        reference = reference_sketch(raw_path, artifacts_dir, config.text_column)
+    live = load_sketches(sketch_dir)
+
+    psi: Dict[str, float] = {}
+    for name, histogram in live.histograms.items():
+        # OOV rates are absent when the service scores through an MLflow pyfunc model.
+        if histogram.total:
+            psi[name] = population_stability_index(
+                reference.histograms[name].counts, histogram.counts
+            )
+    worst = max(psi.values(), default=0.0)
+    summary: Dict[str, object] = {
+        "psi": psi,
+        "max_psi": worst,
+        "status": _drift_status(worst, config) if live.total else "no_data",
+        "live": live.summary(),
+        "reference": reference.summary(),
+    }
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "live_summary.json").write_text(json.dumps(summary, indent=2))
     return summary
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare live prediction sketches with training")
+    parser.add_argument("--ds", required=True, help="UTC date of the live sketches (YYYY-MM-DD)")
+    parser.add_argument("--train-ds", required=True, help="Partition the served model trained on")
+    parser.add_argument("--params", type=Path, default=Path("include/configs/params.yaml"))
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    parser.add_argument("--sketch-dir", type=Path, default=Path("data/sketches"))
+    args = parser.parse_args()
+
+    from src.pipeline.config import drift_config, load_params
+
+    summary = run_live_drift_report(
+        raw_path=args.data_dir / "raw" / f"imdb_{args.train_ds}.csv",
+        artifacts_dir=args.data_dir / "artifacts" / args.train_ds,
+        sketch_dir=args.sketch_dir / args.ds,
+        config=drift_config(load_params(args.params)),
+        output_dir=args.data_dir / "monitor" / args.ds,
+    )
+    print(json.dumps({key: summary[key] for key in ("psi", "status")}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Fixed bin edges shared by the service and the drift job, so live and reference sketches
+# are always comparable bin for bin. The outer edges are open: values beyond them land in
+# the first or last bin.
+SKETCH_EDGES: Dict[str, np.ndarray] = {
+    "probability": np.linspace(0.0, 1.0, 21),
+    "text_length": np.concatenate([[0.0], np.geomspace(16, 32768, 12)]),
+    "oov_rate": np.linspace(0.0, 1.0, 21),
+}
+SKETCH_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Histogram:
+    """Fixed-bin histogram: constant memory, one vectorised update per batch."""
+
+    def __init__(self, edges: np.ndarray, counts: np.ndarray | None = None) -> None:
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = (
+            np.zeros(len(self.edges) - 1, dtype=np.int64)
+            if counts is None
+            else np.asarray(counts, dtype=np.int64)
+        )
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def update(self, values: Iterable[float]) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        bins = np.searchsorted(self.edges[1:-1], values, side="right")
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+    def merge(self, other: Histogram) -> None:
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges")
+        self.counts += other.counts
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile, interpolating linearly inside the bin that holds it."""
+        total = self.total
+        if total == 0:
+            return float("nan")
+        cumulative = np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, q * total, side="left"))
+        index = min(index, len(self.counts) - 1)
+        below = cumulative[index - 1] if index else 0
+        fraction = (q * total - below) / max(self.counts[index], 1)
+        low, high = self.edges[index], self.edges[index + 1]
+        return float(low + min(max(fraction, 0.0), 1.0) * (high - low))
+
+
+class PredictionSketch:
+    """Streaming summary of scored traffic: probabilities, text lengths and OOV rates."""
+
+    def __init__(self, histograms: Dict[str, Histogram] | None = None) -> None:
+        self.histograms = histograms or {
+            name: Histogram(edges) for name, edges in SKETCH_EDGES.items()
+        }
+
+    @property
+    def total(self) -> int:
+        return self.histograms["probability"].total
+
+    def update(
+        self,
+        probabilities: Iterable[float],
+        text_lengths: Iterable[int],
+        oov_rates: Iterable[float] | None = None,
+    ) -> None:
+        self.histograms["probability"].update(probabilities)
+        self.histograms["text_length"].update(text_lengths)
+        # pyfunc models tokenize internally, so OOV rates are only known for local models.
+        if oov_rates is not None:
+            self.histograms["oov_rate"].update(oov_rates)
+
+    def merge(self, other: PredictionSketch) -> None:
+        for name, histogram in self.histograms.items():
+            histogram.merge(other.histograms[name])
+
+    def to_dict(self) -> Dict[str, Dict[str, List[float]]]:
+        return {
+            name: {"edges": histogram.edges.tolist(), "counts": histogram.counts.tolist()}
+            for name, histogram in self.histograms.items()
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Dict[str, List[float]]]) -> PredictionSketch:
+        return cls(
+            {
+                name: Histogram(np.asarray(data["edges"]), np.asarray(data["counts"]))
+                for name, data in payload.items()
+            }
+        )
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "count": histogram.total,
+                **{f"p{round(q * 100)}": histogram.quantile(q) for q in SKETCH_QUANTILES},
+            }
+            for name, histogram in self.histograms.items()
+        }
+
+
+def population_stability_index(
+    reference: np.ndarray, current: np.ndarray, epsilon: float = 1e-4
+) -> float:
+    """PSI between two count vectors over the same bins; empty bins are floored at epsilon."""
+    expected = np.maximum(reference / max(reference.sum(), 1), epsilon)
+    actual = np.maximum(current / max(current.sum(), 1), epsilon)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class SketchRecorder:
+    """Accumulate a worker's sketch and write it out every ``flush_seconds``.
+
+    Each flush writes the window's counts to a new ``<directory>/<UTC date>/*.json`` file
+    and starts a fresh window, so files never need merging in place and workers never
+    share a file. Windows are flushed by ``record`` and by ``flush_periodically``, so an
+    idle worker still writes out its last window on time. Like ``AdmissionController``,
+    it runs on the worker's event loop and needs no locking.
+    """
+
+    def __init__(self, directory: Path, flush_seconds: float = 60.0) -> None:
+        self.directory = Path(directory)
+        self.flush_seconds = flush_seconds
+        self.sketch = PredictionSketch()
+        self._window_start = time.monotonic()
+        self._sequence = 0
+
+    @classmethod
+    def from_env(cls) -> SketchRecorder | None:
+        directory = os.getenv("PREDICTION_SKETCH_DIR")
+        if not directory:
+            return None
+        return cls(Path(directory), float(os.getenv("PREDICTION_SKETCH_FLUSH_SECONDS", "60")))
+
+    def record(
+        self,
+        probabilities: Iterable[float],
+        text_lengths: Iterable[int],
+        oov_rates: Iterable[float] | None = None,
+    ) -> None:
+        self.sketch.update(probabilities, text_lengths, oov_rates)
+        self.flush_due()
+
+    def flush_due(self) -> Path | None:
+        if time.monotonic() - self._window_start < self.flush_seconds:
+            return None
+        return self.flush()
+
+    async def flush_periodically(self) -> None:
+        """Flush each window when it is due; run as a task on the worker's event loop."""
+        while True:
+            remaining = self._window_start + self.flush_seconds - time.monotonic()
+            await asyncio.sleep(max(remaining, 0.01))
+            self.flush_due()
+
+    def flush(self) -> Path | None:
+        self._window_start = time.monotonic()
+        if self.sketch.total == 0:
+            return None
+        now = datetime.now(timezone.utc)
+        self._sequence += 1
+        path = (
+            self.directory
+            / now.strftime("%Y-%m-%d")
+            / f"{socket.gethostname()}-{os.getpid()}-{int(now.timestamp() * 1000)}"
+            f"-{self._sequence}.json"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.sketch.to_dict()))
+        tmp_path.replace(path)
+        self.sketch = PredictionSketch()
+        return path
+
+
+def load_sketches(directory: Path) -> PredictionSketch:
+    """Merge every flushed window under ``directory`` (e.g. one UTC date) into one sketch."""
+    merged = PredictionSketch()
+    for path in sorted(Path(directory).glob("**/*.json")):
+        merged.merge(PredictionSketch.from_dict(json.loads(path.read_text())))
+    return merged
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+from datasets import Dataset
+
+from src.data.ingest import IngestConfig, ingest_partition, load_source_dataset
+from src.data.validate import validate_raw
+from src.features.build import VECTORIZER_FILENAME, build_features
+from src.features.select import SELECTED_FEATURES_FILENAME, select_features
+from src.monitor.drift_job import run_drift_report
+from src.pipeline.config import (
+    drift_config,
+    feature_config,
+    feature_selection_config,
+    ingest_config,
+    load_params,
+    quantization_config,
+    training_config,
+)
+from src.pipeline.memo import lookup_memoized, run_memoized
+from src.train.eval import evaluate_run, log_timings
+from src.train.quantize import QUANTIZATION_REPORT_FILENAME, export_quantized
+from src.train.register import evaluate_promotion
+from src.train.train import train_model
+from src.utils.io import load_csv
+from src.utils.profiling import TIMINGS_FILENAME, collect_timings, flush_timings_on_exit
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillConfig:
+    start_date: str
+    end_date: str
+    max_workers: int = 4
+
+
+def date_range(start_date: str, end_date: str) -> List[str]:
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    if end < start:
+        raise ValueError(f"End date {end_date} is before start date {start_date}")
+    return [
+        (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+        for offset in range((end - start).days + 1)
+    ]
+
+
+def _prepare_partition(
+    ds: str,
+    raw_path: Path,
+    params: Dict[str, Any],
+    data_dir: Path,
+    expectation_path: Path,
+) -> Dict[str, str]:
+    """Validate, featurize and optionally select one partition; runs inside a worker process."""
+    timings = data_dir / "artifacts" / ds / TIMINGS_FILENAME
+
+    def validate() -> Dict[str, str]:
+        with flush_timings_on_exit(timings):
+            result = validate_raw(load_csv(raw_path), expectation_path)
+        if not result.success:
+            raise RuntimeError(f"Validation failed for partition {ds}")
+        return {"raw_path": str(raw_path)}
+
+    def build() -> Dict[str, str]:
+        with flush_timings_on_exit(timings):
+            features_path, artifacts_dir = build_features(
+                df=load_csv(raw_path),
+                config=feature_config(params),
+                output_features=data_dir / "features" / f"imdb_{ds}.parquet",
+                artifacts_dir=data_dir / "artifacts" / ds,
+            )
+        return {
+            "features_path": str(features_path),
+            "artifacts_dir": str(artifacts_dir),
+            "vectorizer_path": str(artifacts_dir / VECTORIZER_FILENAME),
+        }
+
+    run_memoized("validate", ds, params, [raw_path, expectation_path], data_dir, validate)
+    outputs = run_memoized("build", ds, params, [raw_path], data_dir, build)
+    selection_cfg = feature_selection_config(params)
+    if selection_cfg is None:
+        return outputs
+
+    features_path = Path(outputs["features_path"])
+    artifacts_dir = Path(outputs["artifacts_dir"])
+    selected_path = data_dir / "features" / f"imdb_{ds}_selected.parquet"
+
+    def select() -> Dict[str, str]:
+        with flush_timings_on_exit(timings):
+            select_features(features_path, selection_cfg, artifacts_dir, selected_path)
+        return {
+            "features_path": str(selected_path),
+            "artifacts_dir": str(artifacts_dir),
+            "selected_features_path": str(artifacts_dir / SELECTED_FEATURES_FILENAME),
+        }
+
+    inputs = [features_path, artifacts_dir / VECTORIZER_FILENAME]
+    return run_memoized("select", ds, params, inputs, data_dir, select)
+
+
+def _ingest_one(
+    ds: str,
+    config: IngestConfig,
+    params: Dict[str, Any],
+    data_dir: Path,
+    dataset: Dataset,
+) -> Path:
+    output_path = data_dir / "raw" / f"imdb_{ds}.csv"
+
+    def ingest() -> Dict[str, str]:
+        with flush_timings_on_exit(data_dir / "artifacts" / ds / TIMINGS_FILENAME):
+            ingest_partition(ds=ds, output_path=output_path, config=config, dataset=dataset)
+        return {"raw_path": str(output_path)}
+
+    return Path(run_memoized("ingest", ds, params, [], data_dir, ingest)["raw_path"])
+
+
+def _ingest_all(
+    dates: List[str],
+    params: Dict[str, Any],
+    data_dir: Path,
+    max_workers: int,
+) -> Dict[str, Path]:
+    raw_paths: Dict[str, Path] = {}
+    for ds in dates:
+        cached = lookup_memoized("ingest", ds, params, [], data_dir)
+        if cached is not None:
+            raw_paths[ds] = Path(cached["raw_path"])
+    pending = [ds for ds in dates if ds not in raw_paths]
+    if not pending:
+        return raw_paths
+    # The one-off source load is attributed to the first partition that needed it, and
+    # flushed here so no later stage or forked worker picks the record up again.
+    config = ingest_config(params)
+    with flush_timings_on_exit(data_dir / "artifacts" / pending[0] / TIMINGS_FILENAME):
+        dataset = load_source_dataset(config)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            ds: pool.submit(_ingest_one, ds, config, params, data_dir, dataset) for ds in pending
+        }
+        raw_paths.update({ds: future.result() for ds, future in futures.items()})
+    return raw_paths
+
+
+def run_backfill(
+    config: BackfillConfig,
+    params: Dict[str, Any],
+    data_dir: Path,
+    expectation_path: Path,
+    model_name: str,
+    promotion_rules: Dict[str, float],
+) -> List[Dict[str, Any]]:
+    """Backfill a date range in one process.
+
+    The source dataset is loaded once, partitions are ingested and featurized in
+    parallel, and train/evaluate/register/monitor then run sequentially in date
+    order so promotion decisions match a one-date-at-a-time catchup.
+    """
+    data_dir = Path(data_dir)
+    dates = date_range(config.start_date, config.end_date)
+    raw_paths = _ingest_all(dates, params, data_dir, config.max_workers)
+
+    prepared: Dict[str, Dict[str, str]] = {}
+    failures: Dict[str, str] = {}
+    # Forked workers inherit this thread's timing records and would write them into their
+    # own partitions; everything recorded so far has already been flushed where it belongs.
+    collect_timings()
+    with ProcessPoolExecutor(max_workers=config.max_workers) as pool:
+        futures = {
+            ds: pool.submit(
+                _prepare_partition, ds, raw_paths[ds], params, data_dir, expectation_path
+            )
+            for ds in dates
+        }
+        for ds, future in futures.items():
+            try:
+                prepared[ds] = future.result()
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Preparing partition %s failed", ds)
+                failures[ds] = str(exc)
+
+    train_cfg = training_config(params)
+    quantization_cfg = quantization_config(params)
+    monitor_cfg = drift_config(params)
+    reference_days = params["monitoring"]["drift_reference_days"]
+    summaries: List[Dict[str, Any]] = []
+    for ds in dates:
+        if ds in failures:
+            summaries.append({"ds": ds, "status": "failed", "reason": failures[ds]})
+            continue
+        outputs = prepared[ds]
+        artifacts_dir = Path(outputs["artifacts_dir"])
+        features_path = Path(outputs["features_path"])
+        timings = artifacts_dir / TIMINGS_FILENAME
+
+        def train() -> Dict[str, str]:
+            with flush_timings_on_exit(timings):
+                model_path, run_id = train_model(
+                    features_path=features_path,
+                    config=train_cfg,
+                    artifacts_dir=artifacts_dir,
+                )
+                if quantization_cfg is not None:
+                    export_quantized(
+                        features_path, artifacts_dir, train_cfg, quantization_cfg, run_id
+                    )
+            return {
+                "run_id": run_id,
+                "metrics_artifact": str(artifacts_dir / "metrics.json"),
+                "model_path": str(model_path),
+            }
+
+        train_inputs = [features_path, artifacts_dir / VECTORIZER_FILENAME]
+        run_id = run_memoized("train", ds, params, train_inputs, data_dir, train)["run_id"]
+
+        def evaluate() -> Dict[str, Any]:
+            with flush_timings_on_exit(timings):
+                evaluation = evaluate_run(
+                    metrics_artifact=artifacts_dir / "metrics.json", run_id=run_id
+                )
+            return {"run_id": run_id, "metrics": evaluation.metrics}
+
+        evaluate_inputs = [
+            artifacts_dir / "metrics.json",
+            artifacts_dir / QUANTIZATION_REPORT_FILENAME,
+        ]
+        metrics = run_memoized("evaluate", ds, params, evaluate_inputs, data_dir, evaluate)[
+            "metrics"
+        ]
+        decision = evaluate_promotion(
+            model_name=model_name,
+            run_id=run_id,
+            metrics=metrics,
+            promotion_rules=promotion_rules,
+        )
+
+        reference_date = (
+            datetime.strptime(ds, "%Y-%m-%d") - timedelta(days=reference_days)
+        ).strftime("%Y-%m-%d")
+        reference_path = data_dir / "features" / f"imdb_{reference_date}.parquet"
+        if not reference_path.exists():
+            reference_path = features_path
+
+        def monitor() -> Dict[str, Any]:
+            with flush_timings_on_exit(timings):
+                drift = run_drift_report(
+                    reference_path=reference_path,
+                    current_path=features_path,
+                    config=monitor_cfg,
+                    output_dir=data_dir / "monitor" / ds,
+                )
+            log_timings(timings, run_id)
+            return drift
+
+        drift_inputs = [reference_path, features_path]
+        drift = run_memoized("monitor", ds, params, drift_inputs, data_dir, monitor)
+        summaries.append(
+            {
+                "ds": ds,
+                "status": "ok",
+                "run_id": run_id,
+                "promoted": decision.promoted,
+                "version": decision.version,
+                "reason": decision.reason,
+                "drift": drift,
+            }
+        )
+
+    if any(summary.get("promoted") for summary in summaries):
+        from src.serve.deploy import trigger_fastapi_reload
+
+        trigger_fastapi_reload(environment={})
+    return summaries
+
+
+def _airflow_variable(name: str, default: str) -> str:
+    """Read a Variable the way the DAGs do; without Airflow, fall back to ``AIRFLOW_VAR_<name>``."""
+    try:
+        from airflow.models import Variable
+    except ImportError:
+        return os.getenv(f"AIRFLOW_VAR_{name}", default)
+    value: str = Variable.get(name, default_var=default)
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill a range of partitions in one process")
+    parser.add_argument("--start", required=True, help="First partition date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="Last partition date (YYYY-MM-DD), inclusive")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--params", type=Path, default=Path("include/configs/params.yaml"))
+    parser.add_argument(
+        "--expectations",
+        type=Path,
+        default=Path("include/expectations/imdb_reviews.json"),
+    )
+    parser.add_argument("--data-dir", type=Path, default=Path("data"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    params = load_params(args.params)
+    promotion_rules = (
+        yaml.safe_load(_airflow_variable("PROMOTION_RULES", "")) or params["promotion"]
+    )
+    summaries = run_backfill(
+        config=BackfillConfig(start_date=args.start, end_date=args.end, max_workers=args.workers),
+        params=params,
+        data_dir=args.data_dir,
+        expectation_path=args.expectations,
+        model_name=_airflow_variable("MODEL_NAME", "imdb_sentiment"),
+        promotion_rules=promotion_rules,
+    )
+    print(json.dumps(summaries, indent=2, default=str))
+    if any(summary["status"] == "failed" for summary in summaries):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+
+import yaml
+
+if TYPE_CHECKING:
+    from src.data.ingest import IngestConfig
+    from src.features.build import FeatureConfig
+    from src.features.select import FeatureSelectionConfig
+    from src.monitor.drift_job import DriftConfig
+    from src.train.quantize import QuantizationConfig
+    from src.train.train import TrainingConfig
+
+
+def load_params(path: Path) -> Dict[str, Any]:
+    with Path(path).open() as fp:
+        params: Dict[str, Any] = yaml.safe_load(fp)
+    return params
+
+
+# Stage modules pull in heavy libraries (datasets, sklearn, evidently), so the
+# config dataclasses are imported lazily inside each builder.
+
+
+def ingest_config(params: Dict[str, Any]) -> IngestConfig:
+    from src.data.ingest import IngestConfig
+
+    return IngestConfig(
+        dataset_name=params["dataset"]["name"],
+        split=params["dataset"]["ingest"]["split"],
+        sample_size=params["dataset"]["ingest"]["daily_sample_size"],
+        seed_offset=params["dataset"]["ingest"]["seed_offset"],
+    )
+
+
+def feature_config(params: Dict[str, Any]) -> FeatureConfig:
+    from src.features.build import FeatureConfig
+
+    return FeatureConfig(
+        text_column=params["features"]["text_column"],
+        label_column=params["features"]["label_column"],
+        tfidf_max_features=params["features"]["tfidf_max_features"],
+        min_df=params["features"]["min_df"],
+        max_df=params["features"]["max_df"],
+    )
+
+
+def feature_selection_config(params: Dict[str, Any]) -> FeatureSelectionConfig | None:
+    """Selection settings, or None when the optional stage is disabled."""
+    selection = params.get("feature_selection", {})
+    if not selection.get("enabled", False):
+        return None
+    from src.features.select import FeatureSelectionConfig
+
+    return FeatureSelectionConfig(
+        label_column=params["features"]["label_column"],
+        k=selection["k"],
+        method=selection.get("method", "chi2"),
+        tradeoff_ks=selection.get("tradeoff_ks", []),
+        test_size=params["training"]["test_size"],
+        random_state=params["training"]["random_state"],
+    )
+
+
+def training_config(params: Dict[str, Any]) -> TrainingConfig:
+    from src.train.train import TrainingConfig
+
+    return TrainingConfig(
+        label_column=params["features"]["label_column"],
+        test_size=params["training"]["test_size"],
+        random_state=params["training"]["random_state"],
+        class_weight=params["training"]["class_weight"],
+    )
+
+
+def quantization_config(params: Dict[str, Any]) -> QuantizationConfig | None:
+    """Export settings for reduced-precision weights, or None when disabled."""
+    quantization = params.get("quantization", {})
+    if not quantization.get("enabled", False):
+        return None
+    from src.train.quantize import QuantizationConfig
+
+    return QuantizationConfig(dtype=quantization.get("dtype", "float16"))
+
+
+def drift_config(params: Dict[str, Any]) -> DriftConfig:
+    from src.monitor.drift_job import DriftConfig
+
+    return DriftConfig(
+        text_column=params["features"]["text_column"],
+        label_column=params["features"]["label_column"],
+        psi_warning_threshold=params["monitoring"]["psi_warning_threshold"],
+        psi_alert_threshold=params["monitoring"]["psi_alert_threshold"],
+    )
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIRNAME = "manifests"
+HASH_CHUNK_BYTES = 1 << 20
+
+# What each memoized task depends on besides its upstream files: the params.yaml
+# sections it reads and the modules whose source defines its behaviour. register and
+# deploy are never memoized because they depend on Model Registry state.
+TASK_PARAMS: Dict[str, List[str]] = {
+    "ingest": ["dataset"],
+    "validate": [],
+    "build": ["features"],
+    "select": ["features", "feature_selection", "training"],
+    "train": ["features", "training", "quantization"],
+    "evaluate": [],
+    "monitor": ["features", "monitoring"],
+}
+# Entry modules only: code_version adds the src.* modules they import at module level, and
+# the helpers the DAG and backfill call around each task are listed here explicitly.
+TASK_CODE: Dict[str, List[str]] = {
+    "ingest": ["src.data.ingest", "src.pipeline.config"],
+    "validate": ["src.data.validate", "src.utils.io"],
+    "build": ["src.features.build", "src.pipeline.config", "src.utils.io"],
+    "select": ["src.features.select", "src.pipeline.config"],
+    "train": ["src.train.train", "src.train.quantize", "src.pipeline.config"],
+    "evaluate": ["src.train.eval"],
+    "monitor": ["src.monitor.drift_job", "src.pipeline.config"],
+}
+CODE_PACKAGE = "src"
+
+
+@dataclass
+class TaskManifest:
+    task: str
+    ds: str
+    fingerprint: str
+    outputs: Dict[str, Any]
+    output_hashes: Dict[str, str] = field(default_factory=dict)
+    completed_at: str = ""
+    duration_seconds: float = 0.0
+
+
+def memoization_enabled() -> bool:
+    return os.getenv("PIPELINE_MEMOIZE", "1").lower() not in {"0", "false", "no"}
+
+
+def hash_file(path: Path) -> str:
+    path = Path(path)
+    if not path.is_file():
+        return "missing"
+    digest = hashlib.sha256()
+    with path.open("rb") as fp:
+        for chunk in iter(lambda: fp.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _module_source(module: str) -> Path:
+    spec = importlib.util.find_spec(module)
+    if spec is None or spec.origin is None:
+        raise ModuleNotFoundError(f"Cannot fingerprint missing module '{module}'")
+    return Path(spec.origin)
+
+
+def _find_spec(name: str) -> Any:
+    try:
+        return importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        return None
+
+
+def _is_module(name: str) -> bool:
+    spec = _find_spec(name)
+    return spec is not None and spec.origin is not None
+
+
+def _is_package(name: str) -> bool:
+    # Checked before probing ``package.name``, which would import a plain module's parent.
+    spec = _find_spec(name)
+    return spec is not None and spec.submodule_search_locations is not None
+
+
+def _imported_modules(source: Path) -> List[str]:
+    """``src.*`` modules imported at module level, skipping ``TYPE_CHECKING`` blocks.
+
+    Imports inside functions are not followed: they are how modules such as
+    ``src.pipeline.config`` avoid depending on every task at once.
+    """
+    found: List[str] = []
+
+    def visit(statements: List[ast.stmt]) -> None:
+        for node in statements:
+            if isinstance(node, ast.Import):
+                found.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                found.append(node.module)
+                # ``from src.features import build`` names a module, not an attribute.
+                if node.module.split(".")[0] == CODE_PACKAGE and _is_package(node.module):
+                    found.extend(f"{node.module}.{alias.name}" for alias in node.names)
+            elif isinstance(node, ast.If):
+                if "TYPE_CHECKING" not in ast.unparse(node.test):
+                    visit(node.body)
+                visit(node.orelse)
+            elif isinstance(node, ast.Try):
+                for block in (node.body, node.orelse, node.finalbody):
+                    visit(block)
+                for handler in node.handlers:
+                    visit(handler.body)
+
+    visit(ast.parse(source.read_text(), filename=str(source)).body)
+    return [name for name in found if name.split(".")[0] == CODE_PACKAGE and _is_module(name)]
+
+
+def code_modules(modules: Sequence[str]) -> List[str]:
+    """``modules`` plus every ``src.*`` module they import at module level, transitively."""
+    seen: set[str] = set()
+    pending = list(modules)
+    while pending:
+        module = pending.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        pending.extend(_imported_modules(_module_source(module)))
+    return sorted(seen)
+
+
+def code_version(modules: Sequence[str]) -> str:
+    """Hash of the modules' and their ``src.*`` imports' source, plus PIPELINE_CODE_VERSION."""
+    digest = hashlib.sha256(os.getenv("PIPELINE_CODE_VERSION", "").encode())
+    for module in code_modules(modules):
+        digest.update(module.encode())
+        digest.update(_module_source(module).read_bytes())
+    return digest.hexdigest()
+
+
+def task_fingerprint(
+    task: str,
+    ds: str,
+    params: Dict[str, Any],
+    inputs: Sequence[Path],
+) -> str:
+    """Fingerprint of everything a task's output depends on."""
+    payload = {
+        "task": task,
+        "ds": ds,
+        "params": {section: params.get(section) for section in TASK_PARAMS[task]},
+        # Content only: the DAG and batch backfill see the same files under different roots.
+        "inputs": [hash_file(path) for path in inputs],
+        "code": code_version(TASK_CODE[task]),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def manifest_path(data_dir: Path, ds: str, task: str) -> Path:
+    return Path(data_dir) / MANIFEST_DIRNAME / ds / f"{task}.json"
+
+
+def _output_files(outputs: Dict[str, Any]) -> List[str]:
+    # String outputs naming existing files are hashed so edited or deleted outputs re-run.
+    # Directories are not: later stages keep writing into artifacts_dir, so tasks name the
+    # artifact files they own (e.g. ``vectorizer_path``) as outputs instead.
+    return [value for value in outputs.values() if isinstance(value, str) and Path(value).is_file()]
+
+
+def find_completed(data_dir: Path, ds: str, task: str, fingerprint: str) -> Dict[str, Any] | None:
+    """Outputs of a completed run with this fingerprint whose files are still intact."""
+    path = manifest_path(data_dir, ds, task)
+    if not path.exists():
+        return None
+    manifest = TaskManifest(**json.loads(path.read_text()))
+    if manifest.fingerprint != fingerprint:
+        return None
+    for output, expected in manifest.output_hashes.items():
+        if hash_file(Path(output)) != expected:
+            return None
+    return manifest.outputs
+
+
+def record_completed(
+    data_dir: Path,
+    ds: str,
+    task: str,
+    fingerprint: str,
+    outputs: Dict[str, Any],
+    duration_seconds: float,
+) -> Path:
+    manifest = TaskManifest(
+        task=task,
+        ds=ds,
+        fingerprint=fingerprint,
+        outputs=outputs,
+        output_hashes={path: hash_file(Path(path)) for path in _output_files(outputs)},
+        completed_at=datetime.now(timezone.utc).isoformat(),
+        duration_seconds=duration_seconds,
+    )
+    path = manifest_path(data_dir, ds, task)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(asdict(manifest), indent=2, sort_keys=True))
+    tmp_path.replace(path)
+    return path
+
+
+def lookup_memoized(
+    task: str,
+    ds: str,
+    params: Dict[str, Any],
+    inputs: Sequence[Path],
+    data_dir: Path,
+) -> Dict[str, Any] | None:
+    """Recorded outputs if the task would be skipped now, else None."""
+    if not memoization_enabled():
+        return None
+    return find_completed(data_dir, ds, task, task_fingerprint(task, ds, params, inputs))
+
+
+def run_memoized(
+    task: str,
+    ds: str,
+    params: Dict[str, Any],
+    inputs: Sequence[Path],
+    data_dir: Path,
+    func: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Return the recorded outputs when the task's fingerprint matches, else run ``func``.
+
+    ``func`` returns the task's JSON-serialisable outputs; a manifest is written only
+    after it succeeds. Set PIPELINE_MEMOIZE=0 to force every task to run.
+    """
+    if not memoization_enabled():
+        return func()
+    fingerprint = task_fingerprint(task, ds, params, inputs)
+    cached = find_completed(data_dir, ds, task, fingerprint)
+    if cached is not None:
+        logger.info("Skipping %s for %s: inputs unchanged (fingerprint %s)", task, ds, fingerprint)
+        return cached
+    start = time.perf_counter()
+    outputs = func()
+    record_completed(data_dir, ds, task, fingerprint, outputs, time.perf_counter() - start)
+    return outputs
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+
+from src.serve.metrics import IN_FLIGHT, QUEUE_TIME, QUEUED_TEXTS, SHED_REQUESTS
+
+# Clients send their remaining time budget in milliseconds; the service counts it from the
+# moment the request arrives and drops the request if it is still queued when it runs out.
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+
+@dataclass
+class AdmissionConfig:
+    """Per-worker limits; 0 disables a limit."""
+
+    max_in_flight: int = 64
+    max_queued_texts: int = 4096
+    max_concurrent_scoring: int = 4
+    retry_after_seconds: int = 1
+
+    @classmethod
+    def from_env(cls) -> AdmissionConfig:
+        return cls(
+            max_in_flight=int(os.getenv("MAX_IN_FLIGHT_REQUESTS", "64")),
+            max_queued_texts=int(os.getenv("MAX_QUEUED_TEXTS", "4096")),
+            max_concurrent_scoring=int(os.getenv("MAX_CONCURRENT_SCORING", "4")),
+            retry_after_seconds=int(os.getenv("RETRY_AFTER_SECONDS", "1")),
+        )
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Service overloaded ({reason})")
+        self.reason = reason
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def parse_deadline(header_value: str | None, received_at: float) -> float | None:
+    """Absolute ``time.monotonic()`` deadline from the header, or None when absent."""
+    if header_value is None:
+        return None
+    try:
+        budget_ms = float(header_value)
+    except ValueError:
+        return None
+    return received_at + budget_ms / 1000
+
+
+class AdmissionController:
+    """Bound the work a worker accepts so bursts are rejected early instead of queueing.
+
+    Requests are counted from arrival to response and their texts from parsing to
+    response; beyond either limit ``Overloaded`` is raised. Admitted requests then wait
+    for one of ``max_concurrent_scoring`` scoring slots, so the queue is visible (and
+    timed) here rather than hidden in the threadpool. Runs on a single event loop, so the
+    counters need no locking.
+    """
+
+    def __init__(self, config: AdmissionConfig) -> None:
+        self.config = config
+        self.in_flight = 0
+        self.queued_texts = 0
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def enter(self) -> None:
+        limit = self.config.max_in_flight
+        if limit and self.in_flight >= limit:
+            self._shed("in_flight")
+        self.in_flight += 1
+        IN_FLIGHT.inc()
+
+    def leave(self, n_texts: int = 0) -> None:
+        self.in_flight -= 1
+        self.queued_texts -= n_texts
+        IN_FLIGHT.dec()
+        QUEUED_TEXTS.dec(n_texts)
+
+    def add_texts(self, n_texts: int) -> None:
+        # A single batch larger than the limit is still admitted onto an empty queue.
+        limit = self.config.max_queued_texts
+        if limit and self.queued_texts and self.queued_texts + n_texts > limit:
+            self._shed("queued_texts")
+        self.queued_texts += n_texts
+        QUEUED_TEXTS.inc(n_texts)
+
+    async def acquire_slot(self, deadline: float | None) -> None:
+        """Wait for a scoring slot; raise ``DeadlineExceeded`` if the deadline passes first."""
+        slots = self._get_slots()
+        start = time.monotonic()
+        acquired = True
+        try:
+            if deadline is None:
+                await slots.acquire()
+            else:
+                await asyncio.wait_for(slots.acquire(), timeout=max(deadline - start, 0))
+        except asyncio.TimeoutError:
+            acquired = False
+        QUEUE_TIME.observe(time.monotonic() - start)
+        if acquired and (deadline is None or time.monotonic() < deadline):
+            return
+        if acquired:
+            slots.release()
+        SHED_REQUESTS.labels(reason="deadline").inc()
+        raise DeadlineExceeded("Request deadline expired before scoring")
+
+    def release_slot(self) -> None:
+        self._get_slots().release()
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they first wait on; rebuild if the app's loop changed.
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.config.max_concurrent_scoring or 2**31 - 1)
+            self._loop = loop
+        return self._slots
+
+    def _shed(self, reason: str) -> None:
+        SHED_REQUESTS.labels(reason=reason).inc()
+        raise Overloaded(reason)
@@ -1,25 +1,69 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+import time
+import uuid
 from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, List
 
 import mlflow
 import numpy as np
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
-from prometheus_client import Counter, Gauge, Histogram, generate_latest
-from starlette.responses import PlainTextResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import PlainTextResponse, Response
+
+from src.monitor.sketch import SketchRecorder
+from src.serve.admission import (
+    DEADLINE_HEADER,
+    AdmissionConfig,
+    AdmissionController,
+    DeadlineExceeded,
+    Overloaded,
+    parse_deadline,
+)
+from src.serve.local_model import LocalSentimentModel
+from src.serve.metrics import (
+    BATCH_SIZE,
+    ERROR_COUNT,
+    EXPLAIN_LATENCY,
+    MODEL_LOAD_SECONDS,
+    MODEL_VERSION,
+    REQUEST_COUNT,
+    REQUEST_LATENCY,
+    STAGE_LATENCY,
+    TEXT_LENGTH,
+    mark_worker_dead,
+    render_metrics,
+    update_worker_memory,
+)
+from src.serve.prediction_log import REQUEST_ID_HEADER, PredictionLogConfig, PredictionLogger
+
+logger = logging.getLogger(__name__)
 
 MODEL_NAME = os.getenv("MODEL_NAME", "imdb_sentiment")
 MODEL_STAGE = os.getenv("MODEL_STAGE", "Production")
+# Serve vectorizer + classifier straight from a local artifacts directory instead of MLflow.
+MODEL_ARTIFACTS_DIR = os.getenv("MODEL_ARTIFACTS_DIR")
+# Score the local model with its reduced-precision export (quantized_model.npz).
+MODEL_QUANTIZED = os.getenv("MODEL_QUANTIZED", "0").lower() in {"1", "true", "yes"}
+# Multi-worker mode (gunicorn preload_app): load the model at import in the master process
+# so forked workers share its pages, with local model arrays mapped from this directory.
+PRELOAD_MODEL = os.getenv("PRELOAD_MODEL", "0").lower() in {"1", "true", "yes"}
+MODEL_SHARED_DIR = os.getenv("MODEL_SHARED_DIR", "/dev/shm/imdb_sentiment_model")
 
 app = FastAPI(title="IMDb Sentiment Service", version="0.1.0")
-
-REQUEST_COUNT = Counter("prediction_requests_total", "Total prediction requests")
-REQUEST_LATENCY = Histogram("prediction_latency_seconds", "Prediction latency in seconds")
-ERROR_COUNT = Counter("prediction_errors_total", "Prediction errors")
-MODEL_VERSION = Gauge("model_version_info", "Current model version", ["version"])
+admission = AdmissionController(AdmissionConfig.from_env())
+# Live drift sketches (PREDICTION_SKETCH_DIR); None when unset.
+sketches = SketchRecorder.from_env()
+_sketch_flusher: asyncio.Task[None] | None = None
+# Sampled audit log of scored texts (PREDICTION_LOG_DIR); None when unset.
+_prediction_log_config = PredictionLogConfig.from_env()
+prediction_log = PredictionLogger(_prediction_log_config) if _prediction_log_config else None
 
 
 class TextPayload(BaseModel):
@@ -36,15 +80,60 @@ class PredictionResponse(BaseModel):
     model_version: str
 
 
-def _load_model() -> mlflow.pyfunc.PyFuncModel:
+class ExplainPayload(BaseModel):
+    text: str = Field(..., min_length=3)
+    top_k: int = Field(10, ge=1, le=100)
+
+
+class TokenContributionResponse(BaseModel):
+    token: str
+    count: int
+    contribution: float
+
+
+class ExplainResponse(BaseModel):
+    probability: float
+    label: int
+    intercept: float
+    contributions: List[TokenContributionResponse]
+    model_version: str
+
+
+def _inline_schema(model: type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema with nested model references inlined, for ``openapi_extra`` bodies."""
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)  # type: ignore[no-any-return]
+
+
+def _load_model() -> mlflow.pyfunc.PyFuncModel | LocalSentimentModel:
+    if MODEL_ARTIFACTS_DIR:
+        local_model = LocalSentimentModel.from_artifacts(
+            Path(MODEL_ARTIFACTS_DIR), quantized=MODEL_QUANTIZED
+        )
+        if PRELOAD_MODEL:
+            local_model.share_arrays(Path(MODEL_SHARED_DIR))
+        return local_model
     model_uri = f"models:/{MODEL_NAME}/{MODEL_STAGE}"
     model = mlflow.pyfunc.load_model(model_uri=model_uri)
     return model
 
 
 @lru_cache
-def get_model() -> mlflow.pyfunc.PyFuncModel:
+def get_model() -> mlflow.pyfunc.PyFuncModel | LocalSentimentModel:
+    start = time.perf_counter()
     model = _load_model()
+    MODEL_LOAD_SECONDS.set(time.perf_counter() - start)
     version = model.metadata.run_id
     MODEL_VERSION.labels(version=version).set(1)
     return model
@@ -60,37 +149,191 @@ def health() -> Dict[str, Any]:
     return {"status": "ok", "model_version": version}
 
 
-@app.post("/predict", response_model=PredictionResponse)
-def predict(payload: BatchPayload) -> PredictionResponse:
+def _score(texts: List[str]) -> tuple[List[float], str, np.ndarray | None]:
+    model = get_model()
+    oov_rates = None
+    if isinstance(model, LocalSentimentModel):
+        start = time.perf_counter()
+        features, oov_rates = model.transform_with_oov(texts)
+        STAGE_LATENCY.labels(stage="tokenize").observe(time.perf_counter() - start)
+        start = time.perf_counter()
+        preds = model.predict_features(features)
+    else:
+        # pyfunc models tokenize internally, so the whole call is attributed to "model".
+        start = time.perf_counter()
+        preds = model.predict(texts)
+    if isinstance(preds, list):
+        preds = np.array(preds)
+    if preds.ndim == 1:
+        probabilities = preds.tolist()
+    else:
+        probabilities = preds[:, 1].tolist()
+    STAGE_LATENCY.labels(stage="model").observe(time.perf_counter() - start)
+    return probabilities, model.metadata.run_id, oov_rates
+
+
+def _overloaded(exc: Overloaded) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(exc),
+        headers={"Retry-After": str(admission.config.retry_after_seconds)},
+    )
+
+
+async def _parse_texts(request: Request) -> List[str]:
+    # The body is parsed here rather than by FastAPI so parsing shows up as its own stage.
+    start = time.perf_counter()
+    try:
+        payload = BatchPayload.model_validate_json(await request.body())
+    except ValidationError as exc:
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in exc.errors()]
+        raise RequestValidationError(errors) from exc
+    STAGE_LATENCY.labels(stage="parse").observe(time.perf_counter() - start)
     if not payload.inputs:
         raise HTTPException(status_code=400, detail="inputs must not be empty")
+    return [item.text for item in payload.inputs]
 
-    with REQUEST_LATENCY.time():
-        REQUEST_COUNT.inc()
-        try:
-            model = get_model()
-            texts = [item.text for item in payload.inputs]
-            preds = model.predict(texts)
-            if isinstance(preds, list):
-                preds = np.array(preds)
-            if preds.ndim == 1:
-                probabilities = preds.tolist()
-            else:
-                probabilities = preds[:, 1].tolist()
-            labels = (np.array(probabilities) >= 0.5).astype(int).tolist()
-            return PredictionResponse(
-                probabilities=probabilities,
-                labels=labels,
-                model_version=model.metadata.run_id,
+
+async def _predict_texts(texts: List[str], request_id: str) -> Response:
+    REQUEST_COUNT.inc()
+    update_worker_memory()
+    BATCH_SIZE.observe(len(texts))
+    text_lengths = [len(text) for text in texts]
+    for length in text_lengths:
+        TEXT_LENGTH.observe(length)
+    try:
+        probabilities, model_version, oov_rates = await run_in_threadpool(_score, texts)
+        if sketches is not None:
+            sketches.record(probabilities, text_lengths, oov_rates)
+        start = time.perf_counter()
+        labels = (np.array(probabilities) >= 0.5).astype(int).tolist()
+        body = PredictionResponse(
+            probabilities=probabilities,
+            labels=labels,
+            model_version=model_version,
+        ).model_dump_json()
+        STAGE_LATENCY.labels(stage="serialize").observe(time.perf_counter() - start)
+        if prediction_log is not None:
+            prediction_log.log(request_id, model_version, texts, probabilities, labels)
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={REQUEST_ID_HEADER: request_id},
+        )
+    except Exception as exc:  # noqa: BLE001
+        ERROR_COUNT.inc()
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@app.post(
+    "/predict",
+    response_model=PredictionResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": _inline_schema(BatchPayload)}},
+            "required": True,
+        }
+    },
+)
+async def predict(request: Request) -> Response:
+    deadline = parse_deadline(request.headers.get(DEADLINE_HEADER), time.monotonic())
+    # Echoed back and stored with logged predictions so feedback labels can be joined later.
+    request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+    try:
+        admission.enter()
+    except Overloaded as exc:
+        raise _overloaded(exc) from exc
+    n_texts = 0
+    try:
+        with REQUEST_LATENCY.time():
+            texts = await _parse_texts(request)
+            try:
+                admission.add_texts(len(texts))
+            except Overloaded as exc:
+                raise _overloaded(exc) from exc
+            n_texts = len(texts)
+            try:
+                await admission.acquire_slot(deadline)
+            except DeadlineExceeded as exc:
+                raise HTTPException(status_code=504, detail=str(exc)) from exc
+            try:
+                return await _predict_texts(texts, request_id)
+            finally:
+                admission.release_slot()
+    finally:
+        admission.leave(n_texts)
+
+
+def _explain(payload: ExplainPayload) -> ExplainResponse:
+    model = get_model()
+    if not isinstance(model, LocalSentimentModel):
+        raise HTTPException(
+            status_code=501,
+            detail="Explanations need the local model (set MODEL_ARTIFACTS_DIR)",
+        )
+    explanation = model.explain(payload.text, top_k=payload.top_k)
+    return ExplainResponse(
+        probability=explanation.probability,
+        label=int(explanation.probability >= 0.5),
+        intercept=explanation.intercept,
+        contributions=[
+            TokenContributionResponse(
+                token=item.token, count=item.count, contribution=item.contribution
             )
-        except Exception as exc:  # noqa: BLE001
-            ERROR_COUNT.inc()
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
+            for item in explanation.contributions
+        ],
+        model_version=model.metadata.run_id,
+    )
+
+
+@app.post("/explain", response_model=ExplainResponse)
+async def explain(payload: ExplainPayload) -> ExplainResponse:
+    """Top tokens by logit contribution, scored by the same model instance as /predict."""
+    try:
+        admission.enter()
+    except Overloaded as exc:
+        raise _overloaded(exc) from exc
+    try:
+        await admission.acquire_slot(deadline=None)
+        try:
+            with EXPLAIN_LATENCY.time():
+                return await run_in_threadpool(_explain, payload)
+        finally:
+            admission.release_slot()
+    finally:
+        admission.leave()
 
 
 @app.get("/metrics")
 def metrics() -> PlainTextResponse:
-    data = generate_latest()
+    update_worker_memory(force=True)
+    data = render_metrics()
     return PlainTextResponse(data.decode("utf-8"), media_type="text/plain; version=0.0.4")
 
 
+@app.on_event("startup")
+async def start_sketch_flusher() -> None:
+    # Started per worker after fork; without it a window is only flushed by the next request.
+    global _sketch_flusher
+    if sketches is not None:
+        _sketch_flusher = asyncio.create_task(sketches.flush_periodically())
+
+
+@app.on_event("shutdown")
+def release_worker_metrics() -> None:
+    if _sketch_flusher is not None:
+        _sketch_flusher.cancel()
+    if sketches is not None:
+        sketches.flush()
+    if prediction_log is not None:
+        prediction_log.close()
+    mark_worker_dead(os.getpid())
+
+
+if PRELOAD_MODEL:
+    # A failed preload (no Production model yet, MLflow still starting) must not stop the
+    # master from booting: workers then load lazily on first use, as without preload.
+    try:
+        get_model()
+    except Exception:  # noqa: BLE001
+        logger.exception("Model preload failed; workers will load the model on first request")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import gc
+import os
+
+# preload_app imports the app (and, with PRELOAD_MODEL=1, loads the model) once in the
+# master; forked workers then share those pages copy-on-write.
+
+bind = "0.0.0.0:8000"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+
+def pre_fork(server, worker):  # type: ignore[no-untyped-def]
+    # Move everything allocated so far into the permanent generation so the cyclic GC in
+    # each worker never writes to (and un-shares) the preloaded model's object headers.
+    gc.freeze()
+
+
+def child_exit(server, worker):  # type: ignore[no-untyped-def]
+    from src.serve.metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
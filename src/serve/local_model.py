@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.features.select import load_selected_features
+from src.features.tokenizer import VocabularyTokenizer
+from src.utils.quantization import QUANTIZED_MODEL_FILENAME, load_quantized_arrays
+
+
+@dataclass
+class ModelMetadata:
+    run_id: str
+
+
+@dataclass
+class TokenContribution:
+    token: str
+    count: int
+    contribution: float
+
+
+@dataclass
+class Explanation:
+    probability: float
+    intercept: float
+    contributions: List[TokenContribution]
+
+
+class LocalSentimentModel:
+    """Score texts with the vectorizer and classifier from a local artifacts directory.
+
+    Mirrors the ``predict``/``metadata.run_id`` surface of an MLflow pyfunc model so the
+    service, benchmarks and load tests can run without a tracking server.
+    """
+
+    def __init__(
+        self,
+        vectorizer: TfidfVectorizer,
+        classifier: LogisticRegression,
+        run_id: str,
+        label_column: str = "label",
+        selected_features: np.ndarray | None = None,
+    ) -> None:
+        self.vectorizer = vectorizer
+        self.tokenizer = VocabularyTokenizer.from_vectorizer(vectorizer)
+        self.classifier = classifier
+        self.metadata = ModelMetadata(run_id=run_id)
+        # build_features writes the label and partition columns into the same frame as
+        # the vocabulary, so a vocabulary term with either name is overwritten and then
+        # dropped before training. Reproduce that column selection here.
+        # When the optional selection stage ran, its stored vectorizer ids replace this.
+        dropped = {label_column, "partition_date"}
+        names = vectorizer.get_feature_names_out()
+        self.feature_index = (
+            np.asarray(selected_features, dtype=np.int64)
+            if selected_features is not None
+            else np.array(
+                [index for index, name in enumerate(names) if name not in dropped],
+                dtype=np.int64,
+            )
+        )
+        self._feature_names: np.ndarray | None = None
+        self.token_weights: np.ndarray | None = None
+        self._update_token_weights()
+
+    @classmethod
+    def from_artifacts(
+        cls,
+        artifacts_dir: Path,
+        run_id: str | None = None,
+        quantized: bool = False,
+    ) -> LocalSentimentModel:
+        """Load a model directory; ``quantized`` scores with the reduced-precision export."""
+        artifacts_dir = Path(artifacts_dir)
+        vectorizer = joblib.load(artifacts_dir / "tfidf_vectorizer.joblib")
+        classifier = joblib.load(artifacts_dir / "model.joblib")
+        metadata = json.loads((artifacts_dir / "metadata.json").read_text())
+        model = cls(
+            vectorizer,
+            classifier,
+            run_id=run_id or artifacts_dir.name,
+            label_column=metadata["label_column"],
+            selected_features=load_selected_features(artifacts_dir),
+        )
+        if quantized:
+            model.load_quantized(artifacts_dir / QUANTIZED_MODEL_FILENAME)
+        return model
+
+    def load_quantized(self, path: Path) -> None:
+        """Swap in float32 coefficients and IDF weights dequantized from ``export_quantized``."""
+        arrays = load_quantized_arrays(path)
+        self.classifier.coef_ = arrays["coef"]
+        self.classifier.intercept_ = arrays["intercept"]
+        self.vectorizer.idf_ = arrays["idf"]
+        self.tokenizer.idf = arrays["idf"]
+        self._update_token_weights()
+
+    def share_arrays(self, directory: Path) -> None:
+        """Move the numeric model arrays into ``.npy`` files and map them back read-only.
+
+        Called once before forking workers: every worker then reads the same page-cache
+        pages instead of holding a private copy of the coefficients and IDF weights.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "coef": self.classifier.coef_,
+            "intercept": self.classifier.intercept_,
+            "idf": self.vectorizer.idf_,
+            "feature_index": self.feature_index,
+            "token_weights": self.token_weights,
+        }
+        for name, array in arrays.items():
+            # Other processes may still map the old file: write aside and swap it in atomically.
+            tmp_path = directory / f"{name}.{os.getpid()}.tmp"
+            with tmp_path.open("wb") as fp:
+                np.save(fp, np.ascontiguousarray(array))
+            tmp_path.replace(directory / f"{name}.npy")
+        mapped = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in arrays}
+        self.classifier.coef_ = mapped["coef"]
+        self.classifier.intercept_ = mapped["intercept"]
+        self.vectorizer.idf_ = mapped["idf"]
+        self.tokenizer.idf = mapped["idf"]
+        self.feature_index = mapped["feature_index"]
+        self.token_weights = mapped["token_weights"]
+
+    def _update_token_weights(self) -> None:
+        # A row is tf * idf / ||tf * idf||, so a token's share of the logit is its count
+        # times coef * idf, divided by the row norm. coef * idf is fixed per vocabulary id;
+        # ids the classifier does not use (dropped or unselected columns) weigh zero.
+        weights = np.zeros(len(self.vectorizer.idf_), dtype=np.float64)
+        weights[self.feature_index] = (
+            np.asarray(self.classifier.coef_[0], dtype=np.float64)
+            * self.vectorizer.idf_[self.feature_index]
+        )
+        self.token_weights = weights
+
+    def transform(self, texts: List[str]) -> csr_matrix:
+        """Tokenize and weight texts into the classifier's feature space."""
+        features = self.tokenizer.transform(texts)
+        if len(self.feature_index) != features.shape[1]:
+            features = features[:, self.feature_index]
+        return features
+
+    def transform_with_oov(self, texts: List[str]) -> tuple[csr_matrix, np.ndarray]:
+        """``transform`` plus each text's out-of-vocabulary token rate, in one tokenizer pass."""
+        features, oov_rates = self.tokenizer.transform_with_oov(texts)
+        if len(self.feature_index) != features.shape[1]:
+            features = features[:, self.feature_index]
+        return features, oov_rates
+
+    def predict_features(self, features: csr_matrix) -> np.ndarray:
+        return self.classifier.predict_proba(features)[:, 1]
+
+    def predict(self, texts: List[str]) -> np.ndarray:
+        return self.predict_features(self.transform(texts))
+
+    def explain(self, text: str, top_k: int = 10) -> Explanation:
+        """Per-token logit contributions for one text, largest magnitude first.
+
+        The contributions plus the intercept add up to the logit behind ``probability``,
+        and the cost is one tokenizer pass and a gather over the text's tokens.
+        """
+        assert self.token_weights is not None
+        counts = self.tokenizer.counts([text])
+        ids, tf = counts.indices, counts.data.astype(np.float64)
+        norm = np.sqrt(np.sum((tf * self.tokenizer.idf[ids]) ** 2))
+        contributions = tf * self.token_weights[ids] / norm if norm else np.zeros(len(ids))
+        intercept = float(self.classifier.intercept_[0])
+        logit = intercept + float(contributions.sum())
+        top = np.argsort(-np.abs(contributions), kind="stable")[:top_k]
+        names = self.feature_names
+        return Explanation(
+            probability=float(1 / (1 + np.exp(-logit))),
+            intercept=intercept,
+            contributions=[
+                TokenContribution(
+                    token=str(names[ids[i]]),
+                    count=int(tf[i]),
+                    contribution=float(contributions[i]),
+                )
+                for i in top
+                if contributions[i] != 0
+            ],
+        )
+
+    @property
+    def feature_names(self) -> np.ndarray:
+        if self._feature_names is None:
+            self._feature_names = self.vectorizer.get_feature_names_out()
+        return self._feature_names
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Dict
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# When PROMETHEUS_MULTIPROC_DIR is set (multi-worker uvicorn/gunicorn), prometheus_client
+# keeps metric values in per-process files under that directory and /metrics merges them.
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+REQUEST_COUNT = Counter("prediction_requests_total", "Total prediction requests")
+REQUEST_LATENCY = Histogram("prediction_latency_seconds", "Prediction latency in seconds")
+ERROR_COUNT = Counter("prediction_errors_total", "Prediction errors")
+MODEL_VERSION = Gauge(
+    "model_version_info",
+    "Current model version",
+    ["version"],
+    multiprocess_mode="max",
+)
+
+STAGE_LATENCY = Histogram(
+    "prediction_stage_latency_seconds",
+    "Prediction latency by handler stage (parse, tokenize, model, serialize)",
+    ["stage"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+BATCH_SIZE = Histogram(
+    "prediction_batch_size",
+    "Number of texts per prediction request",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+TEXT_LENGTH = Histogram(
+    "prediction_text_length_chars",
+    "Length of each scored text in characters",
+    buckets=(50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000),
+)
+EXPLAIN_LATENCY = Histogram(
+    "explain_latency_seconds",
+    "Latency of /explain requests in seconds",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "model_load_seconds",
+    "Seconds spent loading the current model",
+    multiprocess_mode="max",
+)
+
+SHED_REQUESTS = Counter(
+    "prediction_shed_requests_total",
+    "Requests rejected by admission control (in_flight, queued_texts, deadline)",
+    ["reason"],
+)
+QUEUE_TIME = Histogram(
+    "prediction_queue_seconds",
+    "Time admitted requests wait for a scoring slot",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+IN_FLIGHT = Gauge(
+    "prediction_in_flight_requests",
+    "Requests admitted and not yet answered",
+    multiprocess_mode="livesum",
+)
+QUEUED_TEXTS = Gauge(
+    "prediction_queued_texts",
+    "Texts in admitted requests not yet answered",
+    multiprocess_mode="livesum",
+)
+
+PREDICTION_LOG_WRITTEN = Counter(
+    "prediction_log_rows_written_total",
+    "Prediction log rows written to Parquet",
+)
+PREDICTION_LOG_DROPPED = Counter(
+    "prediction_log_rows_dropped_total",
+    "Prediction log rows dropped because the queue was full or a write failed",
+)
+PREDICTION_LOG_QUEUE = Gauge(
+    "prediction_log_queued_requests",
+    "Requests waiting for the prediction log writer",
+    multiprocess_mode="livesum",
+)
+
+WORKER_MEMORY = Gauge(
+    "worker_memory_bytes",
+    "Per-worker memory from /proc/self/smaps_rollup (rss, pss, shared, private)",
+    ["kind"],
+    multiprocess_mode="liveall",
+)
+SMAPS_ROLLUP = Path("/proc/self/smaps_rollup")
+WORKER_MEMORY_INTERVAL_SECONDS = 10.0
+_last_memory_update = 0.0
+
+
+def read_worker_memory() -> Dict[str, int]:
+    """Resident, proportional, shared and private bytes of this process (Linux only)."""
+    if not SMAPS_ROLLUP.exists():
+        return {}
+    fields: Dict[str, int] = {}
+    for line in SMAPS_ROLLUP.read_text().splitlines()[1:]:
+        name, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts and parts[-1] == "kB":
+            fields[name] = int(parts[0]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def update_worker_memory(force: bool = False) -> None:
+    """Refresh this worker's memory gauges, at most every WORKER_MEMORY_INTERVAL_SECONDS."""
+    global _last_memory_update
+    now = time.monotonic()
+    if not force and now - _last_memory_update < WORKER_MEMORY_INTERVAL_SECONDS:
+        return
+    _last_memory_update = now
+    for kind, value in read_worker_memory().items():
+        WORKER_MEMORY.labels(kind=kind).set(value)
+
+
+def render_metrics() -> bytes:
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a finished worker's live gauges from the multiprocess aggregation."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)  # type: ignore[no-untyped-call]
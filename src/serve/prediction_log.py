@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.serve.metrics import (
+    PREDICTION_LOG_DROPPED,
+    PREDICTION_LOG_QUEUE,
+    PREDICTION_LOG_WRITTEN,
+)
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-Id"
+
+SCHEMA = pa.schema(
+    [
+        ("logged_at", pa.timestamp("ms", tz="UTC")),
+        ("request_id", pa.string()),
+        ("position", pa.int32()),
+        ("model_version", pa.string()),
+        ("text", pa.string()),
+        ("probability", pa.float64()),
+        ("label", pa.int8()),
+    ]
+)
+
+
+@dataclass
+class PredictionLogConfig:
+    directory: Path
+    sample_rate: float = 1.0
+    max_queued_requests: int = 10000
+    batch_rows: int = 5000
+    flush_seconds: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> PredictionLogConfig | None:
+        directory = os.getenv("PREDICTION_LOG_DIR")
+        if not directory:
+            return None
+        return cls(
+            directory=Path(directory),
+            sample_rate=float(os.getenv("PREDICTION_LOG_SAMPLE_RATE", "1.0")),
+            max_queued_requests=int(os.getenv("PREDICTION_LOG_QUEUE_SIZE", "10000")),
+            batch_rows=int(os.getenv("PREDICTION_LOG_BATCH_ROWS", "5000")),
+            flush_seconds=float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "5")),
+        )
+
+
+@dataclass
+class _LoggedRequest:
+    logged_at: datetime
+    request_id: str
+    model_version: str
+    texts: List[str]
+    probabilities: List[float]
+    labels: List[int]
+
+
+class PredictionLogger:
+    """Hand scored requests to a background thread that writes them as Parquet.
+
+    ``log`` never blocks the request: a sampled-out request costs one ``random()`` call,
+    and when the bounded queue is full the request is dropped and counted instead. The
+    writer drains the queue into batches of up to ``batch_rows`` rows (or whatever arrived
+    within ``flush_seconds``) and writes each batch as a new file under
+    ``<directory>/dt=<UTC date>/hour=<HH>/``, so files rotate with every flush and never
+    need appending.
+    """
+
+    def __init__(self, config: PredictionLogConfig) -> None:
+        self.config = config
+        self._queue: queue.Queue[_LoggedRequest | None] = queue.Queue(config.max_queued_requests)
+        self._thread: threading.Thread | None = None
+        self._pid = 0
+        self._sequence = 0
+
+    def log(
+        self,
+        request_id: str,
+        model_version: str,
+        texts: List[str],
+        probabilities: List[float],
+        labels: List[int],
+    ) -> bool:
+        """Queue one request's predictions; False if it was sampled out or dropped."""
+        if self.config.sample_rate < 1.0 and random.random() >= self.config.sample_rate:
+            return False
+        self._ensure_writer()
+        record = _LoggedRequest(
+            datetime.now(timezone.utc), request_id, model_version, texts, probabilities, labels
+        )
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            PREDICTION_LOG_DROPPED.inc(len(texts))
+            return False
+        PREDICTION_LOG_QUEUE.inc()
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush everything queued so far and stop the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _ensure_writer(self) -> None:
+        # Threads do not survive fork, so a preloaded app starts one per worker on first use;
+        # a writer that died for any reason is replaced on the next request.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="prediction-log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        pending: List[_LoggedRequest] = []
+        rows = 0
+        flush_at = time.monotonic() + self.config.flush_seconds
+        while True:
+            try:
+                record = self._queue.get(timeout=max(flush_at - time.monotonic(), 0.0))
+            except queue.Empty:
+                pass
+            else:
+                if record is None:
+                    break
+                PREDICTION_LOG_QUEUE.dec()
+                pending.append(record)
+                rows += len(record.texts)
+                if rows < self.config.batch_rows and time.monotonic() < flush_at:
+                    continue
+            if pending:
+                self._write(pending)
+                pending, rows = [], 0
+            flush_at = time.monotonic() + self.config.flush_seconds
+        if pending:
+            self._write(pending)
+
+    def _write(self, records: List[_LoggedRequest]) -> None:
+        partitions: Dict[tuple[str, str], Dict[str, List[Any]]] = {}
+        for record in records:
+            key = (record.logged_at.strftime("%Y-%m-%d"), record.logged_at.strftime("%H"))
+            columns = partitions.setdefault(key, {name: [] for name in SCHEMA.names})
+            n_texts = len(record.texts)
+            columns["logged_at"].extend([record.logged_at] * n_texts)
+            columns["request_id"].extend([record.request_id] * n_texts)
+            columns["position"].extend(range(n_texts))
+            columns["model_version"].extend([record.model_version] * n_texts)
+            columns["text"].extend(record.texts)
+            columns["probability"].extend(record.probabilities)
+            columns["label"].extend(record.labels)
+        for (day, hour), columns in partitions.items():
+            self._sequence += 1
+            path = (
+                self.config.directory
+                / f"dt={day}"
+                / f"hour={hour}"
+                / f"{socket.gethostname()}-{os.getpid()}-{int(time.time() * 1000)}"
+                f"-{self._sequence}.parquet"
+            )
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                pq.write_table(pa.Table.from_pydict(columns, schema=SCHEMA), tmp_path)
+                tmp_path.replace(path)
+            except Exception:
+                # Never let a full disk, an unmounted volume or a malformed row take the
+                # writer thread down.
+                logger.exception("Failed to write prediction log %s", path)
+                PREDICTION_LOG_DROPPED.inc(len(columns["text"]))
+                continue
+            PREDICTION_LOG_WRITTEN.inc(len(columns["text"]))
@@ -3,12 +3,18 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 import mlflow
 import numpy as np
 from sklearn.metrics import ConfusionMatrixDisplay
 
+from src.features.select import SELECTION_TRADEOFF_FILENAME
+from src.train.quantize import QUANTIZATION_REPORT_FILENAME
+from src.utils.profiling import TIMINGS_FILENAME, profiled, timing_metrics
+
+TRADEOFF_METRICS = ("accuracy", "pr_auc", "predict_ms_per_1k", "coef_bytes")
+
 
 @dataclass
 class EvaluationResult:
@@ -16,6 +22,30 @@ class EvaluationResult:
     confusion_matrix_path: Path
 
 
+def tradeoff_metrics(tradeoff: List[Dict[str, float]]) -> Dict[str, float]:
+    """Flatten selection tradeoff rows into ``selection.k<k>.<field>`` MLflow metrics."""
+    return {
+        f"selection.k{int(row['k'])}.{name}": float(row[name])
+        for row in tradeoff
+        for name in TRADEOFF_METRICS
+    }
+
+
+def _log_timings(timings_path: Path) -> None:
+    mlflow.log_metrics(timing_metrics(json.loads(timings_path.read_text())))
+    mlflow.log_artifact(str(timings_path), artifact_path="evaluation")
+
+
+def log_timings(timings_path: Path, run_id: str) -> None:
+    """Log ``timings.json`` to an existing run, for stages that finish after evaluation."""
+    timings_path = Path(timings_path)
+    if not timings_path.exists():
+        return
+    with mlflow.start_run(run_id=run_id):
+        _log_timings(timings_path)
+
+
+@profiled("evaluate_run")
 def evaluate_run(metrics_artifact: Path, run_id: str) -> EvaluationResult:
     payload = json.loads(Path(metrics_artifact).read_text())
     metrics = payload["metrics"]
@@ -29,9 +59,24 @@ def evaluate_run(metrics_artifact: Path, run_id: str) -> EvaluationResult:
     figure.savefig(confusion_path)
     figure.clear()
 
+    timings_path = Path(metrics_artifact).parent / TIMINGS_FILENAME
+    # Written by select_features when the optional selection stage ran.
+    tradeoff_path = Path(metrics_artifact).parent / SELECTION_TRADEOFF_FILENAME
+    # Written by export_quantized; its PR-AUC joins the metrics the promotion gate sees.
+    quantization_path = Path(metrics_artifact).parent / QUANTIZATION_REPORT_FILENAME
+    if quantization_path.exists():
+        quantization = json.loads(quantization_path.read_text())
+        metrics["quantized_pr_auc"] = quantization["quantized_pr_auc"]
     with mlflow.start_run(run_id=run_id):
         mlflow.log_metrics(metrics)
         mlflow.log_artifact(str(confusion_path), artifact_path="evaluation")
+        if timings_path.exists():
+            _log_timings(timings_path)
+        if tradeoff_path.exists():
+            mlflow.log_metrics(tradeoff_metrics(json.loads(tradeoff_path.read_text())))
+            mlflow.log_artifact(str(tradeoff_path), artifact_path="evaluation")
+        if quantization_path.exists():
+            mlflow.log_artifact(str(quantization_path), artifact_path="evaluation")
 
     return EvaluationResult(metrics=metrics, confusion_matrix_path=confusion_path)
 
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import pandas as pd
+
+from src.train.quantize import QUANTIZATION_REPORT_FILENAME
+from src.utils.metrics import compute_binary_metrics
+
+METRICS_FILENAME = "metrics.json"
+METRICS_KEY = b'"metrics": '
+TAIL_BYTES = 4096
+STAT_COLUMN = "_stat"
+
+
+def read_scalar_metrics(path: Path) -> Dict[str, float]:
+    """The scalar ``metrics`` block of a ``metrics.json`` without parsing the arrays.
+
+    ``train_model`` writes ``metrics`` after the ``y_test``/``y_proba`` arrays, so it is
+    read from the file's tail; the window doubles until the key is found.
+    """
+    with Path(path).open("rb") as fp:
+        size = fp.seek(0, os.SEEK_END)
+        window = TAIL_BYTES
+        while True:
+            fp.seek(max(size - window, 0))
+            tail = fp.read()
+            start = tail.rfind(METRICS_KEY)
+            if start >= 0:
+                value, _ = json.JSONDecoder().raw_decode(
+                    tail[start + len(METRICS_KEY) :].decode("utf-8")
+                )
+                return {key: float(metric) for key, metric in value.items()}
+            if window >= size:
+                raise ValueError(f"No scalar metrics block in {path}")
+            window *= 2
+
+
+def _stat_key(artifacts_dir: Path) -> str:
+    # A directory is re-read only when one of the files it is summarised from changes.
+    parts = []
+    for name in (METRICS_FILENAME, QUANTIZATION_REPORT_FILENAME, "model.joblib"):
+        path = artifacts_dir / name
+        if path.exists():
+            stat = path.stat()
+            parts.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+    return "|".join(parts)
+
+
+def summarize_artifacts(artifacts_dir: Path) -> Dict[str, Any]:
+    artifacts_dir = Path(artifacts_dir)
+    row: Dict[str, Any] = {"ds": artifacts_dir.name, STAT_COLUMN: _stat_key(artifacts_dir)}
+    row.update(read_scalar_metrics(artifacts_dir / METRICS_FILENAME))
+    quantization_path = artifacts_dir / QUANTIZATION_REPORT_FILENAME
+    if quantization_path.exists():
+        row["quantized_pr_auc"] = json.loads(quantization_path.read_text())["quantized_pr_auc"]
+    model_path = artifacts_dir / "model.joblib"
+    if model_path.exists():
+        row["model_bytes"] = model_path.stat().st_size
+    return row
+
+
+def _load_cache(cache_path: Path | None) -> pd.DataFrame:
+    if cache_path is None or not Path(cache_path).exists():
+        return pd.DataFrame(columns=[STAT_COLUMN]).rename_axis("ds")
+    return pd.read_parquet(cache_path)
+
+
+def _save_cache(table: pd.DataFrame, cache_path: Path | None) -> None:
+    if cache_path is None:
+        return
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    table.to_parquet(tmp_path)
+    tmp_path.replace(cache_path)
+
+
+def _refresh(
+    cache_path: Path | None,
+    directories: Dict[str, Path],
+    compute: Callable[[List[Path]], List[Dict[str, Any]]],
+) -> pd.DataFrame:
+    """Reuse cached rows whose stat key still matches and compute the rest via ``compute``."""
+    cached = _load_cache(cache_path)
+    stale = [
+        ds
+        for ds, path in directories.items()
+        if ds not in cached.index or cached.at[ds, STAT_COLUMN] != _stat_key(path)
+    ]
+    table = cached
+    if stale:
+        fresh = pd.DataFrame(compute([directories[ds] for ds in stale])).set_index("ds")
+        kept = cached.drop(index=stale, errors="ignore")
+        table = pd.concat([kept, fresh]) if len(kept) else fresh
+        _save_cache(table.sort_index(), cache_path)
+    return table.loc[table.index.isin(list(directories))].sort_index()
+
+
+def artifact_dirs(artifacts_root: Path) -> Dict[str, Path]:
+    return {
+        path.name: path
+        for path in sorted(Path(artifacts_root).iterdir())
+        if (path / METRICS_FILENAME).is_file()
+    }
+
+
+def build_leaderboard(
+    artifacts_root: Path,
+    cache_path: Path | None = None,
+    max_workers: int = 8,
+) -> pd.DataFrame:
+    """Scalar metrics of every artifacts directory, indexed by ``ds``.
+
+    Only the tail of each ``metrics.json`` is read, on a thread pool; rows are cached in
+    ``cache_path`` and re-read only for directories that are new or whose files changed.
+    """
+    directories = artifact_dirs(artifacts_root)
+
+    def compute(paths: List[Path]) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(summarize_artifacts, paths))
+
+    return _refresh(cache_path, directories, compute).drop(columns=STAT_COLUMN)
+
+
+_holdout: tuple[List[str], Any] | None = None
+
+
+def _load_holdout(holdout_path: Path, text_column: str, label_column: str) -> None:
+    global _holdout
+    frame = pd.read_csv(holdout_path)
+    _holdout = (frame[text_column].astype(str).tolist(), frame[label_column].to_numpy())
+
+
+def rescore_artifacts(artifacts_dir: Path) -> Dict[str, Any]:
+    """Score one artifacts directory on the holdout loaded by the pool initializer."""
+    from src.serve.local_model import LocalSentimentModel
+
+    if _holdout is None:
+        raise RuntimeError("rescore_artifacts must run in a pool initialised by _load_holdout")
+    texts, labels = _holdout
+    model = LocalSentimentModel.from_artifacts(Path(artifacts_dir))
+    metrics = compute_binary_metrics(labels, model.predict(texts))
+    return {
+        "ds": Path(artifacts_dir).name,
+        STAT_COLUMN: _stat_key(Path(artifacts_dir)),
+        **{f"holdout_{name}": value for name, value in metrics.as_dict.items()},
+    }
+
+
+def rescore_leaderboard(
+    artifacts_root: Path,
+    holdout_path: Path,
+    dates: Sequence[str] | None = None,
+    cache_dir: Path | None = None,
+    max_workers: int = 4,
+    text_column: str = "text",
+    label_column: str = "label",
+) -> pd.DataFrame:
+    """Re-score historical models on one shared holdout through a process pool.
+
+    Each worker process reads the holdout once; results are cached per holdout content,
+    so re-running after new dates land only scores the new models.
+    """
+    directories = artifact_dirs(artifacts_root)
+    if dates:
+        directories = {ds: path for ds, path in directories.items() if ds in set(dates)}
+    holdout_path = Path(holdout_path)
+    digest = hashlib.sha256(holdout_path.read_bytes()).hexdigest()[:16]
+    cache_path = Path(cache_dir) / f"holdout_{digest}.parquet" if cache_dir else None
+
+    def compute(paths: List[Path]) -> List[Dict[str, Any]]:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_load_holdout,
+            initargs=(holdout_path, text_column, label_column),
+        ) as pool:
+            return list(pool.map(rescore_artifacts, paths))
+
+    return _refresh(cache_path, directories, compute).drop(columns=STAT_COLUMN)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Leaderboard of trained models by partition")
+    parser.add_argument("--artifacts-dir", type=Path, default=Path("data/artifacts"))
+    parser.add_argument("--cache-dir", type=Path, default=Path("data/leaderboard"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sort", default="pr_auc", help="Metric column to rank by")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--holdout", type=Path, help="CSV with text/label to re-score models on")
+    parser.add_argument("--dates", nargs="+", help="Only re-score these partitions")
+    parser.add_argument("--output", type=Path, help="Also write the full table as CSV")
+    args = parser.parse_args()
+
+    table = build_leaderboard(
+        args.artifacts_dir, args.cache_dir / "metrics.parquet", max_workers=args.workers
+    )
+    if args.holdout is not None:
+        rescored = rescore_leaderboard(
+            args.artifacts_dir,
+            args.holdout,
+            dates=args.dates,
+            cache_dir=args.cache_dir,
+            max_workers=args.workers,
+        )
+        table = table.join(rescored, how="left")
+    if args.output is not None:
+        table.to_csv(args.output)
+    ranked = table.sort_values(args.sort, ascending=args.sort == "log_loss")
+    print(ranked.head(args.top).to_string(float_format=lambda value: f"{value:.4f}"))
+
+
+if __name__ == "__main__":
+    main()
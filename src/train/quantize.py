@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+import joblib
+import mlflow
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.features.build import load_vectorizer
+from src.train.train import TrainingConfig, split_features
+from src.utils.metrics import compute_binary_metrics
+from src.utils.profiling import file_size, profile_stage, profiled
+from src.utils.quantization import (
+    QUANTIZED_MODEL_FILENAME,
+    load_quantized_arrays,
+    quantize_array,
+)
+
+QUANTIZATION_REPORT_FILENAME = "quantization.json"
+
+
+@dataclass
+class QuantizationConfig:
+    dtype: str = "float16"
+
+
+def _requantize_rows(X: np.ndarray, idf: np.ndarray, quantized_idf: np.ndarray) -> np.ndarray:
+    # Stored rows are L2-normalised tf * idf, so swapping the IDF weights only needs a
+    # per-column rescale and a fresh row normalisation; no raw text is required.
+    rescaled = X * (quantized_idf / idf)
+    norms = np.linalg.norm(rescaled, axis=1, keepdims=True)
+    normalised: np.ndarray = np.divide(
+        rescaled, norms, out=np.zeros_like(rescaled), where=norms > 0
+    )
+    return normalised
+
+
+@profiled("quantize_model")
+def export_quantized(
+    features_path: Path,
+    artifacts_dir: Path,
+    training_config: TrainingConfig,
+    config: QuantizationConfig,
+    run_id: str | None = None,
+) -> Dict[str, float]:
+    """Write reduced-precision coefficients and IDF weights and score them on the test split.
+
+    The held-out split is recreated with the training config, so ``pr_auc`` here is the
+    full-precision score ``train_model`` reported and ``quantized_pr_auc`` is what the
+    quantized arrays achieve on the same rows.
+    """
+    artifacts_dir = Path(artifacts_dir)
+    classifier = joblib.load(artifacts_dir / "model.joblib")
+    vectorizer = load_vectorizer(artifacts_dir)
+
+    df = pd.read_parquet(features_path)
+    X, y = split_features(df, training_config.label_column)
+    term_columns = df.columns.drop([training_config.label_column, "partition_date"])
+    column_ids = [vectorizer.vocabulary_[column] for column in term_columns]
+    _, X_test, _, y_test = train_test_split(
+        X,
+        y,
+        test_size=training_config.test_size,
+        random_state=training_config.random_state,
+        stratify=y,
+    )
+
+    with profile_stage("quantize_model.export") as timing:
+        quantized = {
+            "coef": quantize_array(classifier.coef_, config.dtype),
+            "idf": quantize_array(vectorizer.idf_, config.dtype),
+        }
+        archive = {
+            f"{name}.{part}": array
+            for name, parts in quantized.items()
+            for part, array in parts.items()
+        }
+        output_path = artifacts_dir / QUANTIZED_MODEL_FILENAME
+        np.savez(output_path, intercept=classifier.intercept_, **archive)
+        timing.output_bytes = file_size(output_path)
+
+    with profile_stage("quantize_model.score"):
+        arrays = load_quantized_arrays(output_path)
+        X_quantized = _requantize_rows(
+            X_test, vectorizer.idf_[column_ids], arrays["idf"][column_ids]
+        )
+        logits = X_quantized @ arrays["coef"][0] + arrays["intercept"][0]
+        full_proba = classifier.predict_proba(X_test)[:, 1]
+        full_pr_auc = compute_binary_metrics(y_test, full_proba).pr_auc
+        quantized_pr_auc = compute_binary_metrics(y_test, 1 / (1 + np.exp(-logits))).pr_auc
+
+    full_bytes = classifier.coef_.nbytes + vectorizer.idf_.nbytes
+    report = {
+        "pr_auc": full_pr_auc,
+        "quantized_pr_auc": quantized_pr_auc,
+        "quantized_pr_auc_delta": quantized_pr_auc - full_pr_auc,
+        "quantized_bytes": sum(array.nbytes for array in archive.values()),
+        "full_precision_bytes": full_bytes,
+    }
+    (artifacts_dir / QUANTIZATION_REPORT_FILENAME).write_text(
+        json.dumps({"dtype": config.dtype, **report}, indent=2)
+    )
+    if run_id is not None:
+        # Log next to model.joblib so the registered model version carries both.
+        with mlflow.start_run(run_id=run_id):
+            mlflow.log_artifact(str(output_path), artifact_path="model_artifacts")
+    return report
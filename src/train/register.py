@@ -32,6 +32,21 @@ def evaluate_promotion(
     metrics: Dict[str, float],
     promotion_rules: Dict[str, float],
 ) -> PromotionDecision:
+    tolerance = promotion_rules.get("quantized_pr_auc_tolerance")
+    if tolerance is not None and "quantized_pr_auc" in metrics:
+        quantized_delta = abs(metrics["quantized_pr_auc"] - metrics["pr_auc"])
+        if quantized_delta > tolerance:
+            return PromotionDecision(
+                promoted=False,
+                version=None,
+                reason=(
+                    f"Quantized artifact PR-AUC differs from full precision by "
+                    f"{quantized_delta:.4f} (tolerance {tolerance})"
+                ),
+                challenger_metrics=metrics,
+                production_metrics=None,
+            )
+
     client = mlflow.MlflowClient()
     try:
         client.get_registered_model(model_name)
@@ -13,6 +13,7 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 
 from src.utils.metrics import compute_binary_metrics
+from src.utils.profiling import file_size, profile_stage, profiled
 
 
 @dataclass
@@ -29,13 +30,15 @@ def split_features(df: pd.DataFrame, label_column: str) -> Tuple[np.ndarray, np.
     return X, y
 
 
+@profiled("train_model")
 def train_model(
     features_path: Path,
     config: TrainingConfig,
     artifacts_dir: Path,
 ) -> Tuple[Path, str]:
-    df = pd.read_parquet(features_path)
-    X, y = split_features(df, config.label_column)
+    with profile_stage("train_model.read_features", input_bytes=file_size(features_path)):
+        df = pd.read_parquet(features_path)
+        X, y = split_features(df, config.label_column)
     X_train, X_test, y_train, y_test = train_test_split(
         X,
         y,
@@ -49,8 +52,10 @@ def train_model(
         random_state=config.random_state,
         class_weight=config.class_weight,
     )
-    clf.fit(X_train, y_train)
-    y_proba = clf.predict_proba(X_test)[:, 1]
+    with profile_stage("train_model.fit", input_bytes=X_train.nbytes):
+        clf.fit(X_train, y_train)
+    with profile_stage("train_model.predict", input_bytes=X_test.nbytes):
+        y_proba = clf.predict_proba(X_test)[:, 1]
     metrics = compute_binary_metrics(y_test, y_proba)
 
     artifacts_dir = Path(artifacts_dir)
@@ -69,7 +74,7 @@ def train_model(
         )
     )
 
-    with mlflow.start_run() as run:
+    with profile_stage("train_model.log_mlflow"), mlflow.start_run() as run:
         mlflow.log_params(
             {
                 "model_type": "logistic_regression",
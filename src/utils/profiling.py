@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, TypeVar
+
+PROFILING_ENV = "PIPELINE_PROFILING"
+TIMINGS_FILENAME = "timings.json"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+RSS_SAMPLE_SECONDS = 0.01
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_local = threading.local()
+
+
+@dataclass
+class StageTiming:
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: float = 0.0
+    input_bytes: int | None = None
+    output_bytes: int | None = None
+    calls: int = 1
+
+    @property
+    def as_dict(self) -> Dict[str, float | int]:
+        payload: Dict[str, float | int] = {
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "peak_rss_mb": self.peak_rss_mb,
+            "calls": self.calls,
+        }
+        if self.input_bytes is not None:
+            payload["input_bytes"] = self.input_bytes
+        if self.output_bytes is not None:
+            payload["output_bytes"] = self.output_bytes
+        return payload
+
+
+def profiling_enabled() -> bool:
+    return os.getenv(PROFILING_ENV, "1").lower() not in {"0", "false", "no", "off"}
+
+
+def _records() -> List[StageTiming]:
+    records = getattr(_local, "records", None)
+    if records is None:
+        records = _local.records = []
+    return records
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is the process high-water mark: kilobytes on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def _current_rss_mb() -> float | None:
+    """Resident set size right now, or None where ``/proc`` is unavailable."""
+    try:
+        with open("/proc/self/statm") as fp:
+            resident_pages = int(fp.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * _PAGE_SIZE / (1024 * 1024)
+
+
+class _RssSampler:
+    """Poll current RSS while any stage is open, raising each open stage's peak.
+
+    One daemon thread per process runs only while stages are open. Stages opened in
+    parallel threads share the process RSS, so each sees the others' allocations.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_SECONDS) -> None:
+        self.interval = interval
+        self._reset()
+
+    def _reset(self) -> None:
+        # Also runs in forked children: the parent's lock, thread and open stages do not carry over.
+        self._lock = threading.Lock()
+        self._active: Dict[int, StageTiming] = {}
+        self._thread: threading.Thread | None = None
+
+    def start(self, timing: StageTiming) -> bool:
+        rss = _current_rss_mb()
+        if rss is None:
+            return False
+        with self._lock:
+            timing.peak_rss_mb = rss
+            self._active[id(timing)] = timing
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+                self._thread.start()
+        return True
+
+    def stop(self, timing: StageTiming) -> None:
+        rss = _current_rss_mb() or 0.0
+        with self._lock:
+            self._active.pop(id(timing), None)
+            timing.peak_rss_mb = max(timing.peak_rss_mb, rss)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            rss = _current_rss_mb() or 0.0
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                for timing in self._active.values():
+                    timing.peak_rss_mb = max(timing.peak_rss_mb, rss)
+
+
+_sampler = _RssSampler()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_sampler._reset)
+
+
+@contextmanager
+def profile_stage(name: str, input_bytes: int | None = None) -> Iterator[StageTiming]:
+    """Record wall time, CPU time and peak RSS for a pipeline stage or sub-step.
+
+    Peak RSS is the highest resident size sampled every ``RSS_SAMPLE_SECONDS`` while the
+    stage was open; without ``/proc`` it falls back to the process high-water mark. The
+    yielded ``StageTiming`` may be annotated with ``input_bytes``/``output_bytes``. Records
+    are kept per thread until ``flush_timings`` writes them out. When
+    ``PIPELINE_PROFILING=0`` nothing is measured or recorded.
+    """
+    timing = StageTiming(name=name, input_bytes=input_bytes)
+    if not profiling_enabled():
+        yield timing
+        return
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    sampled = _sampler.start(timing)
+    try:
+        yield timing
+    finally:
+        timing.wall_seconds = time.perf_counter() - wall_start
+        timing.cpu_seconds = time.process_time() - cpu_start
+        if sampled:
+            _sampler.stop(timing)
+        else:
+            timing.peak_rss_mb = _peak_rss_mb()
+        _records().append(timing)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator form of ``profile_stage`` for whole-function stages."""
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with profile_stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def file_size(path: Path) -> int | None:
+    path = Path(path)
+    return path.stat().st_size if path.exists() else None
+
+
+def collect_timings() -> Dict[str, Dict[str, float | int]]:
+    """Aggregate and clear this thread's records, keyed by stage name."""
+    aggregated: Dict[str, StageTiming] = {}
+    records = _records()
+    for record in records:
+        current = aggregated.get(record.name)
+        if current is None:
+            aggregated[record.name] = StageTiming(**record.__dict__)
+            continue
+        current.wall_seconds += record.wall_seconds
+        current.cpu_seconds += record.cpu_seconds
+        current.peak_rss_mb = max(current.peak_rss_mb, record.peak_rss_mb)
+        current.calls += record.calls
+        for field in ("input_bytes", "output_bytes"):
+            value = getattr(record, field)
+            if value is not None:
+                setattr(current, field, (getattr(current, field) or 0) + value)
+    records.clear()
+    return {name: timing.as_dict for name, timing in aggregated.items()}
+
+
+def flush_timings(path: Path) -> Dict[str, Dict[str, float | int]]:
+    """Merge this thread's records into the per-run timing JSON at ``path``."""
+    timings = collect_timings()
+    if not timings:
+        return {}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    existing = json.loads(path.read_text()) if path.exists() else {}
+    existing.update(timings)
+    path.write_text(json.dumps(existing, indent=2, sort_keys=True))
+    return existing
+
+
+@contextmanager
+def flush_timings_on_exit(path: Path) -> Iterator[None]:
+    """Flush this thread's records to ``path`` when the block exits, even on failure."""
+    try:
+        yield
+    finally:
+        flush_timings(path)
+
+
+def timing_metrics(timings: Dict[str, Dict[str, float | int]]) -> Dict[str, float]:
+    """Flatten timings into MLflow metric names, e.g. ``timing.train_model.wall_seconds``."""
+    return {
+        f"timing.{stage}.{field}": float(value)
+        for stage, fields in timings.items()
+        for field, value in fields.items()
+    }
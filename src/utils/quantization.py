@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+# Reduced-precision model arrays shared by the training export and the serving loader.
+QUANTIZED_MODEL_FILENAME = "quantized_model.npz"
+QUANTIZED_ARRAYS = ("coef", "idf")
+SUPPORTED_DTYPES = ("float16", "int8")
+
+
+def quantize_array(array: np.ndarray, dtype: str) -> Dict[str, np.ndarray]:
+    """Reduced-precision copy of ``array``; int8 uses one symmetric scale per array."""
+    if dtype == "float16":
+        return {"values": array.astype(np.float16)}
+    if dtype == "int8":
+        peak = float(np.max(np.abs(array))) if array.size else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+        values = np.clip(np.rint(array / scale), -127, 127).astype(np.int8)
+        return {"values": values, "scale": np.array(scale, dtype=np.float64)}
+    raise ValueError(f"Unsupported quantization dtype '{dtype}'; use one of {SUPPORTED_DTYPES}")
+
+
+def dequantize_array(values: np.ndarray, scale: np.ndarray | None = None) -> np.ndarray:
+    """float32 working copy of a quantized array, as used for scoring."""
+    if scale is None:
+        return values.astype(np.float32)
+    return (values.astype(np.float32) * np.float32(scale)).astype(np.float32)
+
+
+def load_quantized_arrays(path: Path) -> Dict[str, np.ndarray]:
+    """Read ``coef``/``idf`` (dequantized to float32) and the float64 ``intercept``."""
+    with np.load(path) as archive:
+        arrays = {
+            name: dequantize_array(
+                archive[f"{name}.values"],
+                archive[f"{name}.scale"] if f"{name}.scale" in archive else None,
+            )
+            for name in QUANTIZED_ARRAYS
+        }
+        arrays["intercept"] = archive["intercept"]
+    return arrays
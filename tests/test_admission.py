@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from src.serve.admission import (
+    AdmissionConfig,
+    AdmissionController,
+    DeadlineExceeded,
+    Overloaded,
+    parse_deadline,
+)
+
+
+def test_limits_shed_requests_and_texts():
+    controller = AdmissionController(AdmissionConfig(max_in_flight=2, max_queued_texts=10))
+    controller.enter()
+    controller.add_texts(8)
+    controller.enter()
+    with pytest.raises(Overloaded) as exc_info:
+        controller.enter()
+    assert exc_info.value.reason == "in_flight"
+    with pytest.raises(Overloaded) as exc_info:
+        controller.add_texts(3)
+    assert exc_info.value.reason == "queued_texts"
+
+    controller.leave(0)
+    controller.leave(8)
+    assert (controller.in_flight, controller.queued_texts) == (0, 0)
+    # An oversized batch is still admitted when nothing else is queued.
+    controller.enter()
+    controller.add_texts(50)
+
+
+def test_expired_deadline_is_dropped_while_queued():
+    controller = AdmissionController(AdmissionConfig(max_concurrent_scoring=1))
+
+    async def scenario() -> None:
+        await controller.acquire_slot(deadline=None)
+        with pytest.raises(DeadlineExceeded):
+            await controller.acquire_slot(deadline=parse_deadline("20", time.monotonic()))
+        controller.release_slot()
+        await controller.acquire_slot(deadline=parse_deadline("1000", time.monotonic()))
+        controller.release_slot()
+
+    asyncio.run(scenario())
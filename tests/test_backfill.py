@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+import pytest
+from datasets import Dataset
+
+from src.pipeline import backfill as backfill_module
+from src.pipeline.backfill import date_range
+from src.utils.profiling import TIMINGS_FILENAME, collect_timings, profile_stage
+
+
+def test_date_range_is_inclusive():
+    assert date_range("2025-01-30", "2025-02-02") == [
+        "2025-01-30",
+        "2025-01-31",
+        "2025-02-01",
+        "2025-02-02",
+    ]
+    with pytest.raises(ValueError):
+        date_range("2025-01-02", "2025-01-01")
+
+
+def test_ingest_all_loads_source_once(tmp_path: Path, monkeypatch):
+    loads = []
+    source = Dataset.from_dict(
+        {"text": [f"review number {i}" for i in range(50)], "label": [i % 2 for i in range(50)]}
+    )
+
+    def fake_load(config):
+        loads.append(config)
+        with profile_stage("ingest.load_dataset"):
+            return source
+
+    monkeypatch.setattr(backfill_module, "load_source_dataset", fake_load)
+    params = {
+        "dataset": {
+            "name": "imdb",
+            "ingest": {"split": "train", "daily_sample_size": 10, "seed_offset": 42},
+        }
+    }
+    dates = date_range("2025-01-01", "2025-01-03")
+
+    raw_paths = backfill_module._ingest_all(dates, params, tmp_path, max_workers=2)
+
+    assert len(loads) == 1
+    assert sorted(raw_paths) == dates
+    # The source load is written to exactly one partition and not left for later stages.
+    loaded_in = [
+        ds
+        for ds in dates
+        if "ingest.load_dataset"
+        in json.loads((tmp_path / "artifacts" / ds / TIMINGS_FILENAME).read_text())
+    ]
+    assert loaded_in == ["2025-01-01"]
+    assert collect_timings() == {}
+    for ds, path in raw_paths.items():
+        assert path == tmp_path / "raw" / f"imdb_{ds}.csv"
+        assert path.exists()
+
+    # A repair run over the same range finds every partition memoized.
+    assert backfill_module._ingest_all(dates, params, tmp_path, max_workers=2) == raw_paths
+    assert len(loads) == 1
+
+
+def test_cli_reads_the_same_variables_as_the_dags(monkeypatch):
+    monkeypatch.setenv("AIRFLOW_VAR_MODEL_NAME", "imdb_challenger")
+    monkeypatch.setenv("MODEL_NAME", "ignored")
+    assert backfill_module._airflow_variable("MODEL_NAME", "imdb_sentiment") == "imdb_challenger"
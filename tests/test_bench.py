@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from src.bench.suite import compare_results
+from src.bench.synthetic import build_synthetic_artifacts, generate_reviews
+from src.serve.local_model import LocalSentimentModel
+
+
+def test_generate_reviews_is_deterministic():
+    first = generate_reviews(200, seed=7)
+    second = generate_reviews(200, seed=7)
+    assert first.equals(second)
+    assert set(first["label"]) == {0, 1}
+    assert first["text"].str.len().min() >= 20
+
+
+def test_synthetic_artifacts_are_servable(tmp_path: Path):
+    artifacts_dir = build_synthetic_artifacts(tmp_path / "artifacts", n_rows=300)
+    model = LocalSentimentModel.from_artifacts(artifacts_dir)
+    probabilities = model.predict(["brilliant superb moving film", "dreadful tedious awful film"])
+    assert probabilities[0] > 0.5 > probabilities[1]
+
+
+def test_compare_results_flags_regressions():
+    def payload(build_seconds: float, predict_seconds: float) -> dict:
+        return {
+            "results": {
+                "build_features[n=1000]": {"median_seconds": build_seconds},
+                "serve_predict[n=1000]": {"median_seconds": predict_seconds},
+            }
+        }
+
+    regressions = compare_results(payload(1.0, 0.1), payload(2.0, 0.11), threshold=0.2)
+    assert [regression.key for regression in regressions] == ["build_features[n=1000]"]
+    assert regressions[0].ratio == 2.0
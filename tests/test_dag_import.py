@@ -1,5 +1,9 @@
 import importlib
+import json
+import os
 import pkgutil
+import subprocess
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -24,3 +28,38 @@ def test_dag_imports():
     assert not errors, f"DAG import failures: {errors}"
 
 
+# Parse budget per DAG module, measured after Airflow itself is imported.
+DAG_PARSE_BUDGET_SECONDS = 2.0
+HEAVY_MODULES = ["great_expectations", "evidently", "mlflow", "sklearn", "datasets"]
+
+PARSE_PROBE = """
+import importlib, json, sys, time
+import airflow.decorators  # noqa: F401
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(json.loads(sys.argv[2])))
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+
+def test_dag_parse_is_fast_and_lazy():
+    pythonpath = os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": pythonpath}
+    for _, name, is_pkg in pkgutil.iter_modules([str(DAGS_PATH)]):
+        if is_pkg:
+            continue
+        # Each module is parsed in a fresh interpreter so earlier imports do not hide costs.
+        completed = subprocess.run(
+            [sys.executable, "-c", PARSE_PROBE, f"dags.{name}", json.dumps(HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+            env=env,
+            check=True,
+        )
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        assert not probe["heavy"], f"{name} imports heavy modules at parse time: {probe['heavy']}"
+        assert probe["elapsed"] < DAG_PARSE_BUDGET_SECONDS, (
+            f"{name} took {probe['elapsed']:.2f}s to parse (budget {DAG_PARSE_BUDGET_SECONDS}s)"
+        )
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.bench.synthetic import build_synthetic_artifacts, generate_reviews
+from src.train import leaderboard
+
+
+def _write_metrics(artifacts_dir: Path, pr_auc: float, n_rows: int = 5000) -> None:
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "y_test": [1, 0] * (n_rows // 2),
+        "y_proba": np.linspace(0, 1, n_rows).tolist(),
+        "metrics": {"pr_auc": pr_auc, "roc_auc": 0.9, "f1": 0.8, "log_loss": 0.4},
+    }
+    (artifacts_dir / "metrics.json").write_text(json.dumps(payload))
+
+
+def test_read_scalar_metrics_reads_only_the_tail(tmp_path: Path, monkeypatch):
+    _write_metrics(tmp_path / "2025-01-01", pr_auc=0.91)
+    monkeypatch.setattr(leaderboard, "TAIL_BYTES", 16)  # forces the window to grow
+    metrics = leaderboard.read_scalar_metrics(tmp_path / "2025-01-01" / "metrics.json")
+    assert metrics == {"pr_auc": 0.91, "roc_auc": 0.9, "f1": 0.8, "log_loss": 0.4}
+
+
+def test_leaderboard_caches_rows_and_reads_only_new_dirs(tmp_path: Path, monkeypatch):
+    root = tmp_path / "artifacts"
+    for day, pr_auc in [("2025-01-01", 0.91), ("2025-01-02", 0.93)]:
+        _write_metrics(root / day, pr_auc)
+    (root / "not-a-run").mkdir()
+    cache_path = tmp_path / "cache" / "metrics.parquet"
+
+    read = []
+    summarize = leaderboard.summarize_artifacts
+    monkeypatch.setattr(
+        leaderboard,
+        "summarize_artifacts",
+        lambda path: read.append(path.name) or summarize(path),
+    )
+
+    table = leaderboard.build_leaderboard(root, cache_path, max_workers=2)
+    assert list(table.index) == ["2025-01-01", "2025-01-02"]
+    assert table.loc["2025-01-02", "pr_auc"] == 0.93
+    assert sorted(read) == ["2025-01-01", "2025-01-02"]
+
+    _write_metrics(root / "2025-01-03", 0.95)
+    table = leaderboard.build_leaderboard(root, cache_path, max_workers=2)
+    assert list(table.index) == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert read[2:] == ["2025-01-03"]
+
+
+def test_rescore_on_shared_holdout_through_process_pool(tmp_path: Path):
+    root = tmp_path / "artifacts"
+    for day, seed in [("2025-01-01", 0), ("2025-01-02", 1)]:
+        build_synthetic_artifacts(root / day, n_rows=300, seed=seed)
+        _write_metrics(root / day, pr_auc=0.9, n_rows=10)
+    holdout_path = tmp_path / "holdout.csv"
+    generate_reviews(200, seed=7).to_csv(holdout_path, index=False)
+
+    table = leaderboard.rescore_leaderboard(
+        root, holdout_path, cache_dir=tmp_path / "cache", max_workers=2
+    )
+    assert list(table.index) == ["2025-01-01", "2025-01-02"]
+    assert (table["holdout_pr_auc"] > 0.8).all()
+
+    only = leaderboard.rescore_leaderboard(
+        root, holdout_path, dates=["2025-01-02"], cache_dir=tmp_path / "cache"
+    )
+    assert list(only.index) == ["2025-01-02"]
+    assert only.loc["2025-01-02", "holdout_pr_auc"] == table.loc["2025-01-02", "holdout_pr_auc"]
@@ -0,0 +1,73 @@
+import asyncio
+import json
+from pathlib import Path
+
+from src.bench.loadtest import LoadTestConfig, build_payloads, load_texts, run_load_test
+from src.bench.synthetic import build_synthetic_artifacts
+
+
+def test_load_texts_accepts_payloads_and_records(tmp_path: Path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps({"inputs": [{"text": "first review"}, {"text": "second review"}]}),
+                json.dumps({"body": "third review", "title": "ignored"}),
+                "",
+            ]
+        )
+    )
+    assert load_texts(path, text_field="body") == ["first review", "second review", "third review"]
+
+
+def test_build_payloads_cycles_batch_sizes():
+    config = LoadTestConfig(requests=6, batch_sizes=[1, 4])
+    payloads = build_payloads(["a review", "another review"], config)
+    assert [len(payload["inputs"]) for payload in payloads] == [1, 4, 1, 4, 1, 4]
+
+
+def test_in_process_load_test_reports_per_batch_size(tmp_path: Path, monkeypatch):
+    from src.serve import app as app_module
+
+    artifacts_dir = build_synthetic_artifacts(tmp_path / "artifacts", n_rows=300)
+    monkeypatch.setattr(app_module, "MODEL_ARTIFACTS_DIR", str(artifacts_dir))
+    app_module.get_model.cache_clear()
+
+    config = LoadTestConfig(requests=12, concurrency=3, batch_sizes=[1, 8])
+    report = asyncio.run(run_load_test(["brilliant film", "dreadful plot"], config))
+    app_module.get_model.cache_clear()
+
+    assert set(report) == {"all", "batch=1", "batch=8"}
+    assert report["all"]["requests"] == 12
+    assert report["all"]["errors"] == 0
+    assert report["batch=8"]["p50_ms"] <= report["batch=8"]["p99_ms"]
+
+
+def test_rate_mode_counts_backlog_from_scheduled_send_time():
+    import httpx
+
+    from src.bench.loadtest import _replay
+
+    # A service that scores one request at a time, 20 ms each.
+    lock = asyncio.Lock()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        async with lock:
+            await asyncio.sleep(0.02)
+        return httpx.Response(200, json={})
+
+    async def replay():
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            config = LoadTestConfig(requests=10, concurrency=1, rate=1000, batch_sizes=[1])
+            return await _replay(client, build_payloads(["a review"], config), config)
+
+    samples, _ = asyncio.run(replay())
+    # Requests arrive every 1 ms but leave every 20 ms: the last one queued ~180 ms.
+    assert max(sample.latency_seconds for sample in samples) >= 0.15
+
+
+def test_unreachable_service_reports_errors_instead_of_raising():
+    config = LoadTestConfig(requests=3, concurrency=1, batch_sizes=[1], timeout_seconds=2)
+    report = asyncio.run(run_load_test(["a review"], config, url="http://127.0.0.1:9"))
+    assert report["all"]["errors"] == 3
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+from src.pipeline import memo
+from src.pipeline.memo import TASK_CODE, code_modules, manifest_path, run_memoized
+
+PARAMS = {"features": {"min_df": 5}}
+
+
+def _build(calls: list, raw_path: Path, output_path: Path):
+    def run():
+        calls.append(raw_path.read_text())
+        output_path.write_text(raw_path.read_text().upper())
+        return {"features_path": str(output_path)}
+
+    return run
+
+
+def test_task_skips_until_inputs_params_or_outputs_change(tmp_path: Path):
+    raw_path = tmp_path / "raw.csv"
+    output_path = tmp_path / "features.csv"
+    raw_path.write_text("a,b")
+    calls: list = []
+
+    def build(params=PARAMS):
+        func = _build(calls, raw_path, output_path)
+        return run_memoized("build", "2025-01-01", params, [raw_path], tmp_path, func)
+
+    outputs = build()
+    assert manifest_path(tmp_path, "2025-01-01", "build").exists()
+    assert build() == outputs
+    assert len(calls) == 1
+
+    raw_path.write_text("a,b,c")
+    build()
+    assert len(calls) == 2
+
+    build({"features": {"min_df": 2}})
+    assert len(calls) == 3
+
+    output_path.unlink()
+    build({"features": {"min_df": 2}})
+    assert len(calls) == 4 and output_path.exists()
+
+
+def test_deleted_artifact_file_reruns_the_task(tmp_path: Path):
+    raw_path = tmp_path / "raw.csv"
+    artifacts_dir = tmp_path / "artifacts" / "2025-01-01"
+    vectorizer_path = artifacts_dir / "vectorizer.joblib"
+    raw_path.write_text("a,b")
+    calls: list = []
+
+    def build():
+        calls.append(1)
+        artifacts_dir.mkdir(parents=True, exist_ok=True)
+        vectorizer_path.write_bytes(b"vocabulary")
+        return {"artifacts_dir": str(artifacts_dir), "vectorizer_path": str(vectorizer_path)}
+
+    run_memoized("build", "2025-01-01", PARAMS, [raw_path], tmp_path, build)
+    # Later stages writing into the same directory do not invalidate the build.
+    (artifacts_dir / "timings.json").write_text("{}")
+    run_memoized("build", "2025-01-01", PARAMS, [raw_path], tmp_path, build)
+    assert len(calls) == 1
+
+    vectorizer_path.unlink()
+    run_memoized("build", "2025-01-01", PARAMS, [raw_path], tmp_path, build)
+    assert len(calls) == 2 and vectorizer_path.exists()
+
+
+def test_failed_task_records_no_manifest(tmp_path: Path, monkeypatch):
+    def fail():
+        raise RuntimeError("validation failed")
+
+    with pytest.raises(RuntimeError):
+        run_memoized("validate", "2025-01-01", PARAMS, [], tmp_path, fail)
+    assert not manifest_path(tmp_path, "2025-01-01", "validate").exists()
+
+    monkeypatch.setenv("PIPELINE_MEMOIZE", "0")
+    calls = []
+    for _ in range(2):
+        run_memoized("ingest", "2025-01-01", PARAMS, [], tmp_path, lambda: calls.append(1) or {})
+    assert len(calls) == 2
+
+
+def test_code_version_follows_module_level_imports(tmp_path: Path, monkeypatch):
+    assert {"src.utils.metrics", "src.pipeline.config"} <= set(code_modules(TASK_CODE["train"]))
+
+    package = tmp_path / "memopkg"
+    package.mkdir()
+    (package / "task.py").write_text(
+        "from memopkg import helper\n\ndef run():\n    import memopkg.lazy\n"
+    )
+    (package / "helper.py").write_text("SCALE = 1\n")
+    (package / "lazy.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(memo, "CODE_PACKAGE", "memopkg")
+
+    assert code_modules(["memopkg.task"]) == ["memopkg.helper", "memopkg.task"]
+    before = memo.code_version(["memopkg.task"])
+    (package / "helper.py").write_text("SCALE = 2\n")
+    assert memo.code_version(["memopkg.task"]) != before
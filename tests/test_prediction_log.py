@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.serve.metrics import PREDICTION_LOG_DROPPED
+from src.serve.prediction_log import PredictionLogConfig, PredictionLogger
+
+
+def _config(tmp_path: Path, **overrides) -> PredictionLogConfig:
+    return PredictionLogConfig(directory=tmp_path, flush_seconds=0.05, **overrides)
+
+
+def test_logged_requests_are_written_as_partitioned_parquet(tmp_path: Path):
+    prediction_log = PredictionLogger(_config(tmp_path, batch_rows=3))
+    assert prediction_log.log("req-1", "run-a", ["good film", "bad film"], [0.9, 0.2], [1, 0])
+    assert prediction_log.log("req-2", "run-a", ["fine film"], [0.6], [1])
+    assert prediction_log.log("req-3", "run-b", ["dull film"], [0.3], [0])
+    prediction_log.close()
+
+    files = sorted(tmp_path.glob("dt=*/hour=*/*.parquet"))
+    assert files and not list(tmp_path.glob("**/*.tmp"))
+    frame = pd.concat(pd.read_parquet(path) for path in files)
+    assert sorted(frame["request_id"]) == ["req-1", "req-1", "req-2", "req-3"]
+    row = frame[frame["text"] == "bad film"].iloc[0]
+    assert (row["position"], row["probability"], row["label"]) == (1, 0.2, 0)
+    assert set(frame["model_version"]) == {"run-a", "run-b"}
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking(tmp_path: Path, monkeypatch):
+    prediction_log = PredictionLogger(_config(tmp_path, max_queued_requests=1))
+    monkeypatch.setattr(prediction_log, "_ensure_writer", lambda: None)
+    before = PREDICTION_LOG_DROPPED._value.get()
+
+    assert prediction_log.log("req-1", "run-a", ["good film"], [0.9], [1])
+    assert not prediction_log.log("req-2", "run-a", ["bad film", "dull film"], [0.1, 0.2], [0, 0])
+    assert PREDICTION_LOG_DROPPED._value.get() == before + 2
+
+
+def test_sample_rate_skips_requests(tmp_path: Path):
+    prediction_log = PredictionLogger(_config(tmp_path, sample_rate=0.0))
+    assert not prediction_log.log("req-1", "run-a", ["good film"], [0.9], [1])
+    prediction_log.close()
+    assert not list(tmp_path.glob("**/*.parquet"))
+
+
+def test_unwritable_batch_is_dropped_and_writer_survives(tmp_path: Path):
+    prediction_log = PredictionLogger(_config(tmp_path, batch_rows=1))
+    before = PREDICTION_LOG_DROPPED._value.get()
+    # A probability that is not a number fails the Arrow conversion, not the filesystem.
+    assert prediction_log.log("req-1", "run-a", ["odd film"], ["high"], [1])
+    assert prediction_log.log("req-2", "run-a", ["good film"], [0.9], [1])
+    prediction_log.close()
+
+    assert PREDICTION_LOG_DROPPED._value.get() == before + 1
+    frame = pd.concat(pd.read_parquet(path) for path in tmp_path.glob("dt=*/hour=*/*.parquet"))
+    assert list(frame["request_id"]) == ["req-2"]
+
+
+def test_dead_writer_is_restarted(tmp_path: Path):
+    prediction_log = PredictionLogger(_config(tmp_path))
+    assert prediction_log.log("req-1", "run-a", ["good film"], [0.9], [1])
+    prediction_log.close()
+    assert not prediction_log._thread.is_alive()
+
+    assert prediction_log.log("req-2", "run-a", ["fine film"], [0.6], [1])
+    prediction_log.close()
+    frame = pd.concat(pd.read_parquet(path) for path in tmp_path.glob("dt=*/hour=*/*.parquet"))
+    assert sorted(frame["request_id"]) == ["req-1", "req-2"]
@@ -0,0 +1,69 @@
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.profiling import (
+    collect_timings,
+    flush_timings,
+    profile_stage,
+    profiled,
+    timing_metrics,
+)
+
+
+def test_profile_stage_records_and_aggregates():
+    collect_timings()
+
+    @profiled("stage")
+    def work() -> int:
+        with profile_stage("stage.sub", input_bytes=10) as timing:
+            timing.output_bytes = 4
+        return sum(range(1000))
+
+    work()
+    work()
+    timings = collect_timings()
+    assert timings["stage"]["calls"] == 2
+    assert timings["stage.sub"]["input_bytes"] == 20
+    assert timings["stage.sub"]["output_bytes"] == 8
+    assert timings["stage"]["wall_seconds"] >= timings["stage.sub"]["wall_seconds"]
+    assert timings["stage"]["peak_rss_mb"] > 0
+    assert collect_timings() == {}
+
+
+def test_profiling_disabled_records_nothing(monkeypatch):
+    collect_timings()
+    monkeypatch.setenv("PIPELINE_PROFILING", "0")
+    with profile_stage("skipped"):
+        pass
+    assert collect_timings() == {}
+
+
+def test_flush_timings_merges_runs(tmp_path: Path):
+    collect_timings()
+    path = tmp_path / "artifacts" / "timings.json"
+    with profile_stage("ingest"):
+        pass
+    flush_timings(path)
+    with profile_stage("train_model"):
+        pass
+    flush_timings(path)
+
+    payload = json.loads(path.read_text())
+    assert set(payload) == {"ingest", "train_model"}
+    metrics = timing_metrics(payload)
+    assert "timing.train_model.wall_seconds" in metrics
+
+
+def test_peak_rss_is_per_stage_not_process_high_water():
+    collect_timings()
+    with profile_stage("allocate"):
+        block = np.ones(64 * 1024 * 1024 // 8)
+        time.sleep(0.05)
+        del block
+    with profile_stage("idle"):
+        time.sleep(0.05)
+    timings = collect_timings()
+    assert timings["allocate"]["peak_rss_mb"] - timings["idle"]["peak_rss_mb"] > 32
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.bench.synthetic import build_synthetic_artifacts
+from src.serve.local_model import LocalSentimentModel
+from src.train.quantize import QuantizationConfig, export_quantized
+from src.train.register import evaluate_promotion
+from src.train.train import TrainingConfig
+from src.utils.quantization import dequantize_array, quantize_array
+
+TEXTS = ["brilliant superb film", "dreadful awful film", "a quite ordinary story"]
+
+
+def test_int8_round_trip_stays_within_half_a_step():
+    array = np.random.default_rng(0).normal(size=(1, 500))
+    quantized = quantize_array(array, "int8")
+    restored = dequantize_array(quantized["values"], quantized["scale"])
+    assert quantized["values"].dtype == np.int8
+    assert np.max(np.abs(restored - array)) <= quantized["scale"] / 2 + 1e-6
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_export_scores_close_to_full_precision(tmp_path: Path, dtype: str):
+    artifacts_dir = build_synthetic_artifacts(tmp_path / "artifacts", n_rows=300)
+    config = TrainingConfig(label_column="label", test_size=0.2, random_state=0)
+    report = export_quantized(
+        artifacts_dir / "features.parquet", artifacts_dir, config, QuantizationConfig(dtype)
+    )
+    assert abs(report["quantized_pr_auc_delta"]) < 0.01
+    assert report["quantized_bytes"] <= report["full_precision_bytes"] / 3
+    assert json.loads((artifacts_dir / "quantization.json").read_text())["dtype"] == dtype
+
+    full = LocalSentimentModel.from_artifacts(artifacts_dir).predict(TEXTS)
+    quantized = LocalSentimentModel.from_artifacts(artifacts_dir, quantized=True).predict(TEXTS)
+    np.testing.assert_allclose(quantized, full, atol=0.02)
+
+
+def test_promotion_rejects_quantized_artifact_beyond_tolerance():
+    decision = evaluate_promotion(
+        model_name="imdb_sentiment",
+        run_id="run",
+        metrics={"pr_auc": 0.90, "roc_auc": 0.91, "quantized_pr_auc": 0.88},
+        promotion_rules={"quantized_pr_auc_tolerance": 0.005, "baseline_pr_auc": 0.7},
+    )
+    assert not decision.promoted
+    assert "Quantized" in decision.reason
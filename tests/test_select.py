@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.bench.synthetic import FEATURE_CONFIG, generate_reviews
+from src.features.build import build_features
+from src.features.select import (
+    SELECTION_TRADEOFF_FILENAME,
+    FeatureSelectionConfig,
+    load_selected_features,
+    select_features,
+)
+from src.serve.local_model import LocalSentimentModel
+from src.train.train import split_features
+
+
+def test_select_features_prunes_and_serves_same_columns(tmp_path: Path):
+    df = generate_reviews(400, seed=7)
+    features_path, artifacts_dir = build_features(
+        df, FEATURE_CONFIG, tmp_path / "features.parquet", tmp_path / "artifacts"
+    )
+    config = FeatureSelectionConfig(label_column="label", k=50, tradeoff_ks=[10, 50])
+    select_features(features_path, config, artifacts_dir)
+
+    pruned = pd.read_parquet(features_path)
+    X, y = split_features(pruned, "label")
+    assert X.shape[1] == 50
+    selected = load_selected_features(artifacts_dir)
+    assert len(selected) == 50 and np.all(np.diff(selected) > 0)
+
+    tradeoff = json.loads((artifacts_dir / SELECTION_TRADEOFF_FILENAME).read_text())
+    assert [row["k"] for row in tradeoff][:2] == [10, 50]
+    metadata = json.loads((artifacts_dir / "metadata.json").read_text())
+    assert metadata["feature_selection"]["k"] == 50
+
+    joblib.dump(LogisticRegression(max_iter=200).fit(X, y), artifacts_dir / "model.joblib")
+    model = LocalSentimentModel.from_artifacts(artifacts_dir)
+    served = model.transform(df["text"].tolist()).toarray()
+    np.testing.assert_allclose(served, X, rtol=1e-6)
+    proba = model.predict(["brilliant superb film", "dreadful awful film"])
+    assert proba[0] > 0.5 > proba[1]
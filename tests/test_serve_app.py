@@ -0,0 +1,193 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.bench.synthetic import build_synthetic_artifacts
+from src.serve import app as app_module
+
+
+@pytest.fixture(scope="module")
+def artifacts_dir(tmp_path_factory) -> Path:
+    return build_synthetic_artifacts(tmp_path_factory.mktemp("artifacts"), n_rows=300)
+
+
+@pytest.fixture
+def client(artifacts_dir: Path, monkeypatch) -> TestClient:
+    monkeypatch.setattr(app_module, "MODEL_ARTIFACTS_DIR", str(artifacts_dir))
+    app_module.get_model.cache_clear()
+    yield TestClient(app_module.app)
+    app_module.get_model.cache_clear()
+
+
+def _sample(metrics_text: str, name: str) -> float:
+    for line in metrics_text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_predict_records_stage_metrics(client: TestClient, artifacts_dir: Path):
+    before = client.get("/metrics").text
+    response = client.post(
+        "/predict",
+        json={"inputs": [{"text": "brilliant superb film"}, {"text": "dreadful awful film"}]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["labels"] == [1, 0]
+    assert body["model_version"] == artifacts_dir.name
+
+    after = client.get("/metrics").text
+    for stage in ("parse", "tokenize", "model", "serialize"):
+        name = f'prediction_stage_latency_seconds_count{{stage="{stage}"}}'
+        assert _sample(after, name) == _sample(before, name) + 1
+    for name in ("prediction_batch_size_sum", "prediction_text_length_chars_count"):
+        assert _sample(after, name) == _sample(before, name) + 2
+    assert _sample(after, "model_load_seconds") > 0
+
+
+def test_predict_rejects_invalid_payloads(client: TestClient):
+    response = client.post("/predict", json={"inputs": [{"text": "a"}]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "inputs", 0, "text"]
+    assert client.post("/predict", json={"inputs": []}).status_code == 400
+
+
+def test_shared_arrays_are_mapped_and_keep_predictions(artifacts_dir: Path, tmp_path: Path):
+    from src.serve.local_model import LocalSentimentModel
+
+    texts = ["brilliant superb film", "dreadful awful film", "an ordinary afternoon"]
+    model = LocalSentimentModel.from_artifacts(artifacts_dir)
+    expected = model.predict(texts)
+
+    model.share_arrays(tmp_path / "shared")
+    assert isinstance(model.classifier.coef_, np.memmap)
+    assert isinstance(model.feature_index, np.memmap)
+    np.testing.assert_array_equal(model.predict(texts), expected)
+
+    # A reload shares into the same directory while workers still map the old files.
+    LocalSentimentModel.from_artifacts(artifacts_dir).share_arrays(tmp_path / "shared")
+    np.testing.assert_array_equal(model.predict(texts), expected)
+    assert not list((tmp_path / "shared").glob("*.tmp"))
+
+
+def test_overload_returns_429_with_retry_after(client: TestClient, monkeypatch):
+    from src.serve.admission import AdmissionConfig, AdmissionController
+
+    admission = AdmissionController(AdmissionConfig(max_in_flight=1, retry_after_seconds=2))
+    admission.in_flight = 1
+    monkeypatch.setattr(app_module, "admission", admission)
+    response = client.post("/predict", json={"inputs": [{"text": "brilliant film"}]})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    metrics = client.get("/metrics").text
+    assert _sample(metrics, 'prediction_shed_requests_total{reason="in_flight"}') >= 1
+
+
+def test_expired_deadline_is_not_scored(client: TestClient):
+    response = client.post(
+        "/predict",
+        json={"inputs": [{"text": "brilliant film"}]},
+        headers={"X-Request-Deadline-Ms": "0"},
+    )
+    assert response.status_code == 504
+    assert app_module.admission.in_flight == 0
+
+
+def test_predict_records_live_sketch(client: TestClient, tmp_path: Path, monkeypatch):
+    from src.monitor.sketch import SketchRecorder, load_sketches
+
+    recorder = SketchRecorder(tmp_path, flush_seconds=3600)
+    monkeypatch.setattr(app_module, "sketches", recorder)
+    response = client.post(
+        "/predict",
+        json={"inputs": [{"text": "brilliant superb film"}, {"text": "qwerty zxcvb film"}]},
+    )
+    assert response.status_code == 200
+    assert recorder.sketch.total == 2
+
+    recorder.flush()
+    sketch = load_sketches(tmp_path)
+    assert sketch.histograms["oov_rate"].total == 2
+    assert sketch.histograms["oov_rate"].quantile(0.99) > 0.5
+
+
+def test_predict_logs_predictions_with_request_id(client: TestClient, tmp_path: Path, monkeypatch):
+    from src.serve.prediction_log import PredictionLogConfig, PredictionLogger
+
+    prediction_log = PredictionLogger(PredictionLogConfig(directory=tmp_path))
+    monkeypatch.setattr(app_module, "prediction_log", prediction_log)
+    response = client.post(
+        "/predict",
+        json={"inputs": [{"text": "brilliant superb film"}]},
+        headers={"X-Request-Id": "abc123"},
+    )
+    assert response.headers["X-Request-Id"] == "abc123"
+    assert client.post("/predict", json={"inputs": [{"text": "awful film"}]}).headers[
+        "X-Request-Id"
+    ]
+    prediction_log.close()
+
+    frame = pd.concat(pd.read_parquet(path) for path in tmp_path.glob("dt=*/hour=*/*.parquet"))
+    assert "abc123" in set(frame["request_id"])
+    assert frame["model_version"].nunique() == 1
+
+
+def test_explain_matches_predict_for_the_served_model(client: TestClient, artifacts_dir: Path):
+    text = "brilliant superb film with a dreadful ending"
+    predicted = client.post("/predict", json={"inputs": [{"text": text}]}).json()
+    response = client.post("/explain", json={"text": text, "top_k": 3})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["model_version"] == predicted["model_version"]
+    assert body["probability"] == pytest.approx(predicted["probabilities"][0], abs=1e-6)
+    assert body["label"] == predicted["labels"][0]
+    assert len(body["contributions"]) == 3
+    magnitudes = [abs(item["contribution"]) for item in body["contributions"]]
+    assert magnitudes == sorted(magnitudes, reverse=True)
+    assert client.post("/explain", json={"text": "ok", "top_k": 3}).status_code == 422
+
+
+def test_explain_contributions_sum_to_the_logit(artifacts_dir: Path):
+    from src.serve.local_model import LocalSentimentModel
+
+    model = LocalSentimentModel.from_artifacts(artifacts_dir)
+    vocabulary_ids = np.array(sorted(model.vectorizer.vocabulary_.values()))
+    selected = vocabulary_ids[::2]
+    model.feature_index = selected
+    model.classifier.coef_ = model.classifier.coef_[:, : len(selected)]
+    model.classifier.n_features_in_ = len(selected)
+    model._update_token_weights()
+
+    text = "brilliant superb dreadful awful film film"
+    explanation = model.explain(text, top_k=100)
+    logit = explanation.intercept + sum(item.contribution for item in explanation.contributions)
+    assert 1 / (1 + np.exp(-logit)) == pytest.approx(explanation.probability)
+    assert explanation.probability == pytest.approx(model.predict([text])[0], abs=1e-6)
+    names = set(model.feature_names[selected])
+    assert all(item.token in names for item in explanation.contributions)
+
+
+def test_failed_preload_still_imports_the_app(tmp_path: Path):
+    env = {
+        **os.environ,
+        "PRELOAD_MODEL": "1",
+        "MODEL_ARTIFACTS_DIR": str(tmp_path / "missing"),
+        "MODEL_SHARED_DIR": str(tmp_path / "shared"),
+    }
+    completed = subprocess.run(
+        [sys.executable, "-c", "import src.serve.app"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[1],
+        env=env,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert "Model preload failed" in completed.stderr
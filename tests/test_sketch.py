@@ -0,0 +1,112 @@
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.bench.synthetic import build_synthetic_artifacts, generate_reviews
+from src.monitor.drift_job import DriftConfig, run_live_drift_report
+from src.monitor.sketch import (
+    Histogram,
+    PredictionSketch,
+    SketchRecorder,
+    load_sketches,
+    population_stability_index,
+)
+
+CONFIG = DriftConfig(
+    text_column="text",
+    label_column="label",
+    psi_warning_threshold=0.2,
+    psi_alert_threshold=0.3,
+)
+
+
+def test_histogram_counts_and_quantiles():
+    histogram = Histogram(np.linspace(0.0, 1.0, 11))
+    values = np.random.default_rng(0).uniform(size=10_000)
+    histogram.update(values[:4000])
+    histogram.update(np.append(values[4000:], [1.0, 2.0, -1.0]))
+
+    assert histogram.total == 10_003
+    assert histogram.counts[-1] >= 2 and histogram.counts[0] >= 1
+    assert histogram.quantile(0.5) == pytest.approx(np.quantile(values, 0.5), abs=0.01)
+    assert histogram.quantile(0.9) == pytest.approx(np.quantile(values, 0.9), abs=0.01)
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram(np.linspace(0.0, 1.0, 6)))
+
+
+def test_recorder_flushes_windows_that_merge_back(tmp_path: Path):
+    recorder = SketchRecorder(tmp_path, flush_seconds=3600)
+    recorder.record([0.1, 0.9], [120, 40], [0.0, 0.5])
+    recorder.record([0.7], [300])
+    assert recorder.flush() is not None
+    assert recorder.flush() is None  # empty windows are not written
+
+    recorder.flush_seconds = 0
+    recorder.record([0.2], [80], [0.25])
+    assert len(list(tmp_path.glob("*/*.json"))) == 2
+
+    merged = load_sketches(tmp_path)
+    assert merged.total == 4
+    assert merged.histograms["oov_rate"].total == 3
+    assert merged.histograms["text_length"].counts.sum() == 4
+
+
+def test_idle_recorder_flushes_on_schedule(tmp_path: Path):
+    recorder = SketchRecorder(tmp_path, flush_seconds=0.05)
+    recorder.record([0.4], [60])
+
+    async def idle() -> None:
+        flusher = asyncio.create_task(recorder.flush_periodically())
+        await asyncio.sleep(0.2)
+        flusher.cancel()
+
+    asyncio.run(idle())
+    assert load_sketches(tmp_path).total == 1
+    assert recorder.sketch.total == 0
+
+
+def test_psi_is_zero_for_matching_distributions():
+    counts = np.array([10, 30, 60])
+    assert population_stability_index(counts, counts * 5) == pytest.approx(0.0)
+    assert population_stability_index(counts, counts[::-1]) > 0.3
+
+
+def test_live_drift_report_compares_sketches_with_training(tmp_path: Path):
+    artifacts_dir = build_synthetic_artifacts(tmp_path / "artifacts", n_rows=300)
+    raw_path = tmp_path / "raw.csv"
+    generate_reviews(300, seed=0).to_csv(raw_path, index=False)
+
+    from src.serve.local_model import LocalSentimentModel
+
+    model = LocalSentimentModel.from_artifacts(artifacts_dir)
+
+    def live_sketch(texts, directory: Path) -> Path:
+        features, oov_rates = model.transform_with_oov(texts)
+        sketch = PredictionSketch()
+        sketch.update(model.predict_features(features), [len(t) for t in texts], oov_rates)
+        recorder = SketchRecorder(directory)
+        recorder.sketch = sketch
+        recorder.flush()
+        return directory
+
+    similar = generate_reviews(300, seed=1)["text"].tolist()
+    summary = run_live_drift_report(
+        raw_path, artifacts_dir, live_sketch(similar, tmp_path / "similar"), CONFIG, tmp_path / "a"
+    )
+    assert summary["status"] == "normal"
+    assert set(summary["psi"]) == {"probability", "text_length", "oov_rate"}
+    assert (tmp_path / "a" / "live_summary.json").exists()
+
+    shifted = ["qwerty zxcvb asdfg"] * 300
+    summary = run_live_drift_report(
+        raw_path, artifacts_dir, live_sketch(shifted, tmp_path / "shifted"), CONFIG, tmp_path / "b"
+    )
+    assert summary["status"] == "alert"
+    assert summary["psi"]["oov_rate"] > CONFIG.psi_alert_threshold
+
+    empty = run_live_drift_report(
+        raw_path, artifacts_dir, tmp_path / "missing", CONFIG, tmp_path / "c"
+    )
+    assert empty["status"] == "no_data"
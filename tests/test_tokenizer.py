@@ -0,0 +1,42 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.bench.synthetic import generate_reviews
+from src.features.tokenizer import VocabularyTokenizer, analyze
+
+EDGE_CASES = [
+    "",
+    "a I x",
+    "Don't STOP<br />it's A-b, x1 snake_case 2025!",
+    "Café naïve ÉTÉ résumé — 東京 films",
+    "tabs\tand\nnewlines  between   words",
+]
+
+
+def test_analyze_matches_default_vectorizer_tokens():
+    sklearn_analyze = TfidfVectorizer().build_analyzer()
+    texts = EDGE_CASES + generate_reviews(50, seed=4)["text"].tolist()
+    for text in texts:
+        assert analyze(text) == sklearn_analyze(text)
+
+
+def test_transform_is_bit_identical_to_vectorizer():
+    texts = generate_reviews(300, seed=5)["text"].tolist() + EDGE_CASES
+    vectorizer = TfidfVectorizer(max_features=500, min_df=2, dtype=np.float32).fit(texts)
+    expected = vectorizer.transform(texts)
+    actual = VocabularyTokenizer.from_vectorizer(vectorizer).transform(texts)
+
+    assert actual.dtype == expected.dtype
+    np.testing.assert_array_equal(actual.indptr, expected.indptr)
+    np.testing.assert_array_equal(actual.indices, expected.indices)
+    np.testing.assert_array_equal(actual.data.view(np.uint32), expected.data.view(np.uint32))
+
+
+def test_transform_with_oov_reports_unknown_token_share():
+    vectorizer = TfidfVectorizer().fit(["good film", "bad film"])
+    tokenizer = VocabularyTokenizer.from_vectorizer(vectorizer)
+    texts = ["good film", "good unknown film plot", "", "zz qq"]
+    features, oov_rates = tokenizer.transform_with_oov(texts)
+
+    np.testing.assert_allclose(oov_rates, [0.0, 0.5, 0.0, 1.0])
+    assert (features != tokenizer.transform(texts)).nnz == 0